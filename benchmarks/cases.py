@@ -0,0 +1,219 @@
+"""Benchmark cases for `run.py`.
+
+Each case is registered with `@benchmark` and performs one operation per call. Cases marked
+`cold=True` clear casify's caches before every call, so they measure the full cost of an
+operation rather than a cache lookup.
+"""
+
+CASES = {}
+
+
+def benchmark(name, cold=False):
+    def register(func):
+        CASES[name] = {"func": func, "cold": cold}
+        return func
+
+    return register
+
+
+# ─────────────────────────────── solve ────────────────────────────────
+
+
+@benchmark("solve.single", cold=True)
+def solve_single():
+    from casify import solve
+
+    solve("x**2 - x - 6 = 0")
+
+
+@benchmark("solve.single_numerical", cold=True)
+def solve_single_numerical():
+    from casify import solve
+
+    solve("x**3 - 2*x + 1/3 = 0", numerical=True)
+
+
+@benchmark("solve.system", cold=True)
+def solve_system():
+    from casify import solve
+
+    solve("x + y - z = 1", "x + y + 2*z = 3", "-x + y + z = -1")
+
+
+@benchmark("solve.linear_system_large", cold=True)
+def solve_linear_system_large():
+    # A polynomial of degree 19 through 20 points: 20 linear equations in 20 unknowns.
+    from casify import solve
+
+    n = 20
+    solve(
+        *(
+            " + ".join(f"c{i}*{p}**{i}" for i in range(n)) + f" = {p * p - 3}"
+            for p in range(-n // 2, n // 2)
+        )
+    )
+
+
+@benchmark("solve.inequality", cold=True)
+def solve_inequality():
+    from casify import solve
+
+    solve("x**2 - x - 2 > 0")
+
+
+# ────────────────────────────── Function ──────────────────────────────
+
+_f = None
+
+
+def _function():
+    global _f
+
+    if _f is None:
+        from casify import Function
+
+        _f = Function("x**3 - 2*x**2 + sin(x)")
+    return _f
+
+
+@benchmark("function.call_scalar")
+def function_call_scalar():
+    _function()(2)
+
+
+@benchmark("function.call_array")
+def function_call_array():
+    import numpy
+
+    _function()(numpy.linspace(-6, 6, 1024))
+
+
+@benchmark("function.derivative")
+def function_derivative():
+    _function().derivative()
+
+
+@benchmark("function.derivative_at_point")
+def function_derivative_at_point():
+    _function().derivative(2)
+
+
+@benchmark("function.integral_indefinite")
+def function_integral_indefinite():
+    _function().integral()
+
+
+@benchmark("function.integral_definite")
+def function_integral_definite():
+    _function().integral(0, 2)
+
+
+@benchmark("function.zeros_family", cold=True)
+def function_zeros_family():
+    from casify import Function
+
+    for c in range(-3, 4):
+        Function(f"x**3 - 3*x + {c}").extrema(output="raw")
+        Function(f"x**2 - 2*x + {c}").zeros(output="raw")
+
+
+@benchmark("function.analyze", cold=True)
+def function_analyze():
+    from casify import Function
+
+    Function("(x**2 - 1)/(x - 3)").analyze()
+
+
+@benchmark("function.vertical_asymptotes", cold=True)
+def function_vertical_asymptotes():
+    from casify import function
+
+    numerator = "*".join(f"(x - {i})" for i in range(1, 9))
+    denominator = "*".join(f"(x - {i})" for i in range(4, 14))
+    function(f"expand({numerator})/expand({denominator})").vertical_asymptotes()
+
+
+@benchmark("function.derivative_array")
+def function_derivative_array():
+    import numpy
+
+    _function().derivative(numpy.linspace(-6, 6, 1024))
+
+
+@benchmark("function.integral_batch")
+def function_integral_batch():
+    import numpy
+
+    bounds = numpy.linspace(-6, 6, 1025)
+    _function().integral(bounds[:-1], bounds[1:])
+
+
+@benchmark("function.graph_evaluation")
+def function_graph_evaluation():
+    # The numeric part of `Function.graph`: compile a new function and sample it.
+    from casify import Function
+    from casify.sampling import sample, value_range
+
+    value_range(sample(Function("x**3 - 2*x**2 + sin(x)")._numeric(), -7, 7))
+
+
+@benchmark("function.graph_evaluation_poles")
+def function_graph_evaluation_poles():
+    from casify import Function
+    from casify.sampling import sample, value_range
+
+    value_range(sample(Function("tan(x) + 1/(x - 1)")._numeric(), -7, 7))
+
+
+# ───────────────────────── regression & algebra ───────────────────────
+
+_xdata = [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
+_ydata = [1.1, 2.9, 9.2, 19.1, 32.8, 51.2, 72.9, 99.1, 129.2, 162.8]
+
+
+@benchmark("regression.make_model", cold=True)
+def regression_make_model():
+    from casify import make_model
+
+    make_model("a*x**2 + b*x + c", _xdata, _ydata)
+
+
+@benchmark("regression.make_model_linear")
+def regression_make_model_linear():
+    # A model linear in its parameters, compiled once: a single least-squares solve.
+    from casify import make_model
+
+    make_model("a*x**2 + b*x + c", _xdata, _ydata)
+
+
+@benchmark("regression.make_models", cold=True)
+def regression_make_models():
+    # The same template fitted to 200 noisy datasets in the calling process.
+    import numpy
+    from casify import make_models
+
+    rng = numpy.random.default_rng(0)
+    datasets = [
+        (_xdata, numpy.add(_ydata, rng.normal(0, 0.5, len(_ydata)))) for _ in range(200)
+    ]
+    make_models("a*exp(b*x) + c", datasets, workers=1)
+
+
+@benchmark("algebra.div", cold=True)
+def algebra_div():
+    from casify import div
+
+    div("x**4 - 3*x**2 + 2*x - 7", "x**2 + x - 1")
+
+
+# ──────────────────────────────── vectors ─────────────────────────────
+
+
+@benchmark("vector.arithmetic")
+def vector_arithmetic():
+    from casify import Vector2d
+
+    u = Vector2d(1, 2)
+    v = Vector2d(3, -4)
+    (u + v) * (u - v)
+    (u * 2.5).length
@@ -0,0 +1,77 @@
+"""Reports the cold-start cost of `import casify` and of resolving each public symbol.
+
+Every measurement runs in a fresh interpreter, so nothing is cached between them:
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --repeat 9 --json import_times.json
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+_PROBE = """
+import json, time
+t0 = time.perf_counter()
+import casify
+t1 = time.perf_counter()
+getattr(casify, {name!r})
+t2 = time.perf_counter()
+print(json.dumps([t1 - t0, t2 - t1]))
+"""
+
+
+def _measure(name):
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE.format(name=name)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def measure_import_times(names, repeat=5):
+    """Returns `{name: {"import": seconds, "resolve": seconds}}`, medians over `repeat` runs.
+
+    `import` is the time spent in `import casify`, `resolve` the additional time spent looking
+    up `name` (which imports the modules it needs).
+    """
+    results = {}
+    for name in names:
+        runs = [_measure(name) for _ in range(repeat)]
+        results[name] = {
+            "import": statistics.median(run[0] for run in runs),
+            "resolve": statistics.median(run[1] for run in runs),
+        }
+    return results
+
+
+def main():
+    import casify
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per symbol")
+    parser.add_argument("--json", metavar="PATH", help="also write the results to PATH")
+    args = parser.parse_args()
+
+    names = list(casify.__all__) + ["abc", "printing"]
+    results = measure_import_times(names, repeat=args.repeat)
+
+    print(f"{'symbol':<20} {'import casify (ms)':>20} {'resolve (ms)':>14} {'total (ms)':>12}")
+    for name, times in sorted(results.items(), key=lambda item: -item[1]["resolve"]):
+        total = times["import"] + times["resolve"]
+        print(
+            f"{name:<20} {1e3 * times['import']:>20.1f} "
+            f"{1e3 * times['resolve']:>14.1f} {1e3 * total:>12.1f}"
+        )
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Times casify's main public APIs and compares the results against a saved baseline.
+
+    python benchmarks/run.py                      # run, compare with benchmarks/baseline.json
+    python benchmarks/run.py --save-baseline      # run and store the results as the baseline
+    python benchmarks/run.py -k solve --output results.json
+
+Each case is timed as the median over `--repeat` runs of a loop sized to take about
+`--min-time` seconds. A case whose median is more than `--threshold` (default 20 %) slower
+than the baseline is reported as a regression, and the exit status is then 1.
+"""
+
+import argparse
+import json
+import pathlib
+import platform
+import statistics
+import sys
+import time
+
+from cases import CASES
+
+DEFAULT_BASELINE = pathlib.Path(__file__).with_name("baseline.json")
+
+
+def _time_case(case, number):
+    func = case["func"]
+    if case["cold"]:
+        from casify.cache import clear_caches
+
+        start = time.perf_counter()
+        for _ in range(number):
+            clear_caches()
+            func()
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return time.perf_counter() - start
+
+
+def time_case(case, repeat=5, min_time=0.2):
+    """Returns the median and minimum time per call of `case`, in seconds."""
+    case["func"]()  # warm up imports and lazily compiled state
+
+    number = 1
+    while True:
+        elapsed = _time_case(case, number)
+        if elapsed >= min_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    runs = [elapsed / number] + [
+        _time_case(case, number) / number for _ in range(repeat - 1)
+    ]
+    return {"median": statistics.median(runs), "min": min(runs), "number": number}
+
+
+def run(pattern=None, repeat=5, min_time=0.2):
+    import numpy
+    import sympy
+
+    results = {}
+    for name, case in CASES.items():
+        if pattern is not None and pattern not in name:
+            continue
+        results[name] = time_case(case, repeat=repeat, min_time=min_time)
+        print(f"{name:<36} {_format_time(results[name]['median']):>10}", flush=True)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sympy": sympy.__version__,
+            "numpy": numpy.__version__,
+        },
+        "results": results,
+    }
+
+
+def compare(results, baseline, threshold=0.2):
+    """Prints each case next to its baseline and returns the names of the regressed cases."""
+    regressions = []
+    print()
+    print(f"{'case':<36} {'baseline':>10} {'now':>10} {'ratio':>8}")
+    for name, result in results["results"].items():
+        if name not in baseline["results"]:
+            print(f"{name:<36} {'-':>10} {_format_time(result['median']):>10}")
+            continue
+
+        before = baseline["results"][name]["median"]
+        ratio = result["median"] / before
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        else:
+            flag = ""
+        print(
+            f"{name:<36} {_format_time(before):>10} "
+            f"{_format_time(result['median']):>10} {ratio:>7.2f}x{flag}"
+        )
+
+    return regressions
+
+
+def _format_time(seconds):
+    for unit, scale in [("s", 1), ("ms", 1e-3), ("µs", 1e-6)]:
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-k", metavar="PATTERN", help="only run cases containing PATTERN")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per case")
+    parser.add_argument(
+        "--min-time", type=float, default=0.2, help="minimum seconds per timed run"
+    )
+    parser.add_argument("--output", metavar="PATH", help="write the results as JSON to PATH")
+    parser.add_argument(
+        "--baseline",
+        metavar="PATH",
+        default=DEFAULT_BASELINE,
+        help="baseline to compare against (default: benchmarks/baseline.json)",
+    )
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="store the results as the baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="relative slowdown reported as a regression (default: 0.2)",
+    )
+    args = parser.parse_args()
+
+    results = run(pattern=args.k, repeat=args.repeat, min_time=args.min_time)
+
+    if args.output:
+        pathlib.Path(args.output).write_text(json.dumps(results, indent=2))
+
+    baseline_path = pathlib.Path(args.baseline)
+    if args.save_baseline:
+        baseline_path.write_text(json.dumps(results, indent=2))
+        print(f"\nSaved baseline to {baseline_path}")
+        return 0
+
+    if not baseline_path.exists():
+        print(f"\nNo baseline at {baseline_path}; run with --save-baseline to create one.")
+        return 0
+
+    baseline = json.loads(baseline_path.read_text())
+    regressions = compare(results, baseline, threshold=args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+"""Runs casify's solving and Function APIs concurrently and checks every result.
+
+Each case is first run once on its own to get the expected result. The cases are then run
+many times in random order from a thread pool, and once more through `asolve` on an event
+loop, and every result is compared with the expected one. Finally, time-limited calls are
+made as the first thing in fresh interpreters, where importing SymPy must not count
+against (or be interrupted by) the time limit:
+
+    python benchmarks/stress.py
+    python benchmarks/stress.py --threads 16 --rounds 50 --solve-cache
+
+The exit status is 1 if any result differs or any call raises.
+"""
+
+import argparse
+import asyncio
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _function_values(expr, xs):
+    from casify import Function
+
+    return [round(float(y), 9) for y in Function(expr)(xs)]
+
+
+def _derivative(expr, x):
+    from casify import Function
+
+    return str(Function(expr).derivative(x))
+
+
+def _solve(*eqs, **kwargs):
+    from casify import solve
+
+    return solve(*eqs, **kwargs)
+
+
+def _cases():
+    """Returns `(name, func, args, kwargs)` tuples; the functions are casify's public APIs."""
+    cases = [
+        ("quadratic", _solve, ("x**2 - x - 6 = 0",), {}),
+        ("quadratic_latex", _solve, ("x**2 - x - 6 = 0",), {"output": "latex"}),
+        ("numerical", _solve, ("x**3 - 2*x + 1/3 = 0",), {"numerical": True}),
+        ("system", _solve, ("x + y - z = 1", "x + y + 2*z = 3", "-x + y + z = -1"), {}),
+        ("inequality_x", _solve, ("x**2 - x - 2 > 0",), {}),
+        ("inequality_t", _solve, ("t**2 < 4",), {}),
+        ("inequality_all_y", _solve, ("y**2 >= -1",), {}),
+        ("inequality_none_s", _solve, ("s**2 < -1",), {}),
+        ("no_solution", _solve, ("x**2 = -1",), {}),
+        ("values", _function_values, ("x**3 - 2*x**2 + sin(x)", [-2.0, 0.5, 3.0]), {}),
+        ("derivative", _derivative, ("x**3 - 2*x**2 + sin(x)", 2), {}),
+    ]
+    # The same function name means something different in each of these.
+    for i in range(4):
+        namespace = {"f": f"a*x**2 + b*x + {i}"}
+        cases.append(
+            (f"namespace_{i}", _solve, ("f(1) = 2", "f(-1) = 3"), {"namespace": namespace})
+        )
+    return cases
+
+
+def _call(case):
+    _, func, args, kwargs = case
+    try:
+        return func(*args, **kwargs)
+    except Exception as exc:  # reported as a mismatch
+        return f"{type(exc).__name__}: {exc}"
+
+
+def run_threads(cases, expected, threads, rounds):
+    """Runs every case `rounds` times from `threads` threads. Returns the failures."""
+    tasks = [case for case in cases for _ in range(rounds)]
+    random.shuffle(tasks)
+
+    with ThreadPoolExecutor(threads) as pool:
+        results = list(pool.map(_call, tasks))
+
+    return [
+        (case[0], result)
+        for case, result in zip(tasks, results)
+        if result != expected[case[0]]
+    ]
+
+
+def run_async(cases, expected, rounds):
+    """Awaits `rounds` rounds of the solve cases through `asolve`. Returns the failures."""
+    from casify import asolve
+
+    solve_cases = [case for case in cases if case[1] is _solve]
+
+    async def main():
+        tasks = [case for case in solve_cases for _ in range(rounds)]
+        random.shuffle(tasks)
+        results = await asyncio.gather(
+            *(asolve(*args, **kwargs) for _, _, args, kwargs in tasks),
+            return_exceptions=True,
+        )
+        return [
+            (case[0], result)
+            for case, result in zip(tasks, results)
+            if result != expected[case[0]]
+        ]
+
+    return asyncio.run(main())
+
+
+_HARD = "x**7 + 3*x**5*sin(x) - exp(x)*x**3 + log(x + 5) = 2*x**2 + tan(x)"
+
+_COLD_START = {
+    "cold_solve": (
+        "print(repr(casify.solve('x = 1', timeout=0.4)))",
+        "'x = 1'",
+    ),
+}
+for _workers in (1, 2):
+    _COLD_START[f"cold_solve_many_{_workers}"] = (
+        "print([r if isinstance(r, str) else type(r).__name__ for r in casify.solve_many("
+        f"['x**2 = 4', {_HARD!r}, 'x = 3', 'x + 1 = 0'], workers={_workers}, timeout=0.4)])",
+        "['x = -2 ∨ x = 2', 'CasifyTimeout', 'x = 3', 'x = -1']",
+    )
+
+
+def run_cold_start():
+    """Runs time-limited calls first thing in fresh interpreters. Returns the failures as
+    `(name, expected, result)` tuples."""
+    failures = []
+    for name, (code, expected) in _COLD_START.items():
+        process = subprocess.run(
+            [sys.executable, "-c", f"import casify\n{code}"],
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+        )
+        result = process.stdout.strip() or process.stderr.strip().splitlines()[-1]
+        if result != expected:
+            failures.append((name, expected, result))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8, help="threads in the pool")
+    parser.add_argument("--rounds", type=int, default=20, help="runs per case")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the call order")
+    parser.add_argument(
+        "--solve-cache", action="store_true", help="turn on the solve cache while running"
+    )
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    if args.solve_cache:
+        from casify import enable_solve_cache
+
+        enable_solve_cache()
+
+    cases = _cases()
+    expected = {case[0]: _call(case) for case in cases}
+
+    start = time.perf_counter()
+    failures = run_threads(cases, expected, args.threads, args.rounds)
+    failures += run_async(cases, expected, args.rounds)
+    failures = [(name, expected[name], result) for name, result in failures]
+    failures += run_cold_start()
+    elapsed = time.perf_counter() - start
+
+    for name, expected_result, result in failures:
+        print(f"{name}: expected {expected_result!r}, got {result!r}")
+    print(
+        f"{len(cases)} cases x {args.rounds} rounds on {args.threads} threads and asolve, "
+        f"{len(_COLD_START)} cold starts: {len(failures)} failure(s) in {elapsed:.1f} s"
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,41 +1,88 @@
-from .equation import solve, Solve, nsolve
-from .likning import løs, Løs, nløs
-from .function import function, Function
-from .funksjon import funksjon, Funksjon
-from .algebra import (
-    expand,
-    factor,
-    utvid,
-    Utvid,
-    faktoriser,
-    Faktoriser,
-    div,
-    Div,
-    polynomdivisjon,
-    Polynomdivisjon,
-)
-from .regression import make_model
-from .regresjon import lag_modell, reg
+import importlib
 
+# `function` and `vector` share their names with the modules defining them. Importing those
+# modules binds them as attributes of the package, which would shadow the functions if they
+# were resolved lazily, so these two are imported up front. Neither module imports anything
+# heavy at load time.
+from .function import function, Function
 from .vector import vector, Vector2d
 
-from .vektor import vektor, Vektor2d, vinkel
 
-from . import abc
+# Maps every other public name to the module it is defined in. The modules are imported the
+# first time one of their names is looked up, so `import casify` doesn't pull in SymPy.
+_lazy_names = {
+    "solve": ".equation",
+    "Solve": ".equation",
+    "nsolve": ".equation",
+    "solve_many": ".equation",
+    "asolve": ".equation",
+    "løs": ".likning",
+    "Løs": ".likning",
+    "nløs": ".likning",
+    "løs_mange": ".likning",
+    "aløs": ".likning",
+    "Namespace": ".namespace",
+    "funksjon": ".funksjon",
+    "Funksjon": ".funksjon",
+    "expand": ".algebra",
+    "factor": ".algebra",
+    "utvid": ".algebra",
+    "Utvid": ".algebra",
+    "faktoriser": ".algebra",
+    "Faktoriser": ".algebra",
+    "div": ".algebra",
+    "Div": ".algebra",
+    "polynomdivisjon": ".algebra",
+    "Polynomdivisjon": ".algebra",
+    "make_model": ".regression",
+    "make_models": ".regression",
+    "lag_modell": ".regresjon",
+    "lag_modeller": ".regresjon",
+    "reg": ".regresjon",
+    "vektor": ".vektor",
+    "Vektor2d": ".vektor",
+    "vinkel": ".vektor",
+    "draw_triangle": ".triangle",
+    "render_many": ".rendering",
+    "clear_caches": ".cache",
+    "enable_solve_cache": ".cache",
+    "disable_solve_cache": ".cache",
+    "save_solve_cache": ".cache",
+    "CasifyTimeout": ".timeout",
+    "set_default_timeout": ".timeout",
+}
+
+_lazy_modules = ["abc", "printing"]
+
+
+def __getattr__(name):
+    if name in _lazy_modules:
+        value = importlib.import_module(f".{name}", __name__)
+    elif name in _lazy_names:
+        value = getattr(importlib.import_module(_lazy_names[name], __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-from . import printing
+    globals()[name] = value
+    return value
 
 
-from .triangle import draw_triangle
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_names) | set(_lazy_modules))
 
 
 __all__ = [
     "solve",
     "nsolve",
+    "solve_many",
     "løs",
     "nløs",
+    "løs_mange",
+    "asolve",
+    "aløs",
     "Solve",
     "Løs",
+    "Namespace",
     "function",
     "Function",
     "funksjon",
@@ -56,7 +103,11 @@ __all__ = [
     "Vektor2d",
     "vinkel",
     "lag_modell",
+    "lag_modeller",
     "make_model",
+    "make_models",
     "reg",
     "draw_triangle",
+    "render_many",
+    "CasifyTimeout",
 ]
@@ -1,5 +1,8 @@
 # import sympy
 
+from .cache import parse
+from .printing import pretty
+
 
 def factor(expr):
     """Factorizes an algebraic expression
@@ -12,7 +15,7 @@ def factor(expr):
     """
     import sympy
 
-    expr = sympy.sympify(expr)
+    expr = parse(expr)
     return sympy.factor(expr)
 
 
@@ -28,7 +31,7 @@ def expand(expr):
     """
     import sympy
 
-    expr = sympy.sympify(expr)
+    expr = parse(expr)
     return sympy.expand(expr)
 
 
@@ -71,14 +74,14 @@ def Utvid(uttrykk):
 def div(p, q):
     import sympy
 
-    p = sympy.sympify(p)
-    q = sympy.sympify(q)
+    p = parse(p)
+    q = parse(q)
 
     k, r = sympy.div(p, q)
 
     res = k + r / q
 
-    return sympy.pretty(res, order="grlex")
+    return pretty(res, order="grlex")
 
 
 def Div(p, q):
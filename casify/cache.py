@@ -0,0 +1,258 @@
+import atexit
+import os
+import pickle
+import re
+import threading
+import time
+from collections import OrderedDict
+
+
+_MISSING = object()
+
+
+class LRUCache:
+    """A bounded, thread-safe least-recently-used cache.
+
+    Args:
+        maxsize (int): maximum number of entries. `0` disables caching.
+        ttl (float, optional): seconds an entry stays valid. Defaults to `None` (no expiry).
+        path (str, optional): file the entries are loaded from and saved to by `load`/`save`.
+
+    Attributes:
+        hits (int): number of lookups that found an entry.
+        misses (int): number of lookups that didn't.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None, path=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (value, time stored)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _expired(self, stored_at):
+        return self.ttl is not None and time.time() - stored_at > self.ttl
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value, stored_at = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            if self._expired(stored_at):
+                del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            if self.maxsize <= 0:
+                return
+            self._entries[key] = (value, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def resize(self, maxsize):
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._entries) > max(maxsize, 0):
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def info(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+    def save(self, path=None):
+        """Writes the unexpired entries to `path` (defaults to `self.path`) with pickle."""
+        path = self.path if path is None else path
+        with self._lock:
+            entries = [
+                (key, value, stored_at)
+                for key, (value, stored_at) in self._entries.items()
+                if not self._expired(stored_at)
+            ]
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as fh:
+            pickle.dump(entries, fh)
+        os.replace(tmp_path, path)
+
+    def load(self, path=None):
+        """Reads entries written by `save` from `path` (defaults to `self.path`).
+
+        Only load files you wrote yourself: the entries are unpickled.
+        """
+        path = self.path if path is None else path
+        with open(path, "rb") as fh:
+            entries = pickle.load(fh)
+        with self._lock:
+            for key, value, stored_at in entries:
+                if not self._expired(stored_at):
+                    self._entries[key] = (value, stored_at)
+                    self._entries.move_to_end(key)
+            while len(self._entries) > max(self.maxsize, 0):
+                self._entries.popitem(last=False)
+
+
+_parse_cache = LRUCache(maxsize=1024)
+
+_solve_cache = None  # opt-in, see `enable_solve_cache`
+
+# Compiled regression models, see `regression._compile_model`
+_model_cache = LRUCache(maxsize=128)
+
+
+def parse(expr, functions=()):
+    """Converts `expr` to a SymPy expression like `sympy.sympify`, caching parsed strings.
+
+    Strings are keyed on their whitespace-normalized form, so `"x**2 + 1"` and `" x**2  + 1 "`
+    share an entry. SymPy expressions are immutable, so the cached objects are safe to share.
+
+    Args:
+        expr (str or sympy.Expr): the expression to parse.
+        functions (iterable of str, optional): names to parse as undefined functions where
+            they are called, even if SymPy defines them (such as `N`, `S` or `gamma`).
+
+    Returns:
+        sympy.Expr: the parsed expression.
+    """
+    import sympy
+
+    if not isinstance(expr, str):
+        return sympy.sympify(expr)
+
+    key = " ".join(expr.split())
+    functions = tuple(
+        sorted(name for name in functions if re.search(rf"\b{re.escape(name)}\s*\(", key))
+    )
+    if functions:
+        key = (key, functions)
+    parsed = _parse_cache.get(key, _MISSING)
+    if parsed is _MISSING:
+        text = key[0] if functions else key
+        local_dict = {name: sympy.Function(name) for name in functions}
+        if text.count("+") + text.count("-") >= _LONG_SUM_TERMS:
+            from sympy.parsing.sympy_parser import convert_xor, standard_transformations
+
+            # The transformations `sympify` uses, so `^` is a power here too.
+            parsed = _evaluate(
+                sympy.parse_expr(
+                    text,
+                    local_dict=local_dict,
+                    transformations=standard_transformations + (convert_xor,),
+                    evaluate=False,
+                )
+            )
+        else:
+            parsed = sympy.sympify(text, locals=local_dict)
+        _parse_cache.set(key, parsed)
+    return parsed
+
+
+_LONG_SUM_TERMS = 20  # strings with this many `+` and `-` are parsed unevaluated first
+
+
+def _evaluate(expr):
+    """Evaluates an expression parsed with `evaluate=False` from the leaves up.
+
+    Parsing `a + b + c + ...` normally builds and sorts a new sum for every `+`, which is
+    quadratic in the number of terms. The unevaluated parse keeps the terms of a sum together,
+    so each sum is built once here.
+    """
+    if not expr.args:
+        return expr
+    return expr.func(*[_evaluate(arg) for arg in expr.args])
+
+
+def set_parse_cache_size(maxsize):
+    """Sets the maximum number of parsed expressions kept in memory. `0` disables the cache."""
+    _parse_cache.resize(maxsize)
+
+
+def parse_cache_info():
+    """Returns a dict with the hits, misses, current size and maximum size of the parse cache."""
+    return _parse_cache.info()
+
+
+def enable_solve_cache(maxsize=1024, ttl=None, path=None):
+    """Turns on memoization of `solve` (and thereby `løs`) results.
+
+    Equations are keyed on a canonical form, so reordering a system, changing whitespace or
+    writing `3 = x` instead of `x = 3` all hit the same entry.
+
+    Args:
+        maxsize (int): maximum number of cached results. Defaults to `1024`.
+        ttl (float, optional): seconds a result stays valid. Defaults to `None` (no expiry).
+        path (str, optional): file to persist the cache to. Existing entries are loaded from it
+            now and the cache is written back when the interpreter exits.
+
+    Examples:
+        >>> import casify
+        >>> casify.enable_solve_cache(maxsize=10_000, ttl=3600, path="solve_cache.pkl")
+    """
+    global _solve_cache
+
+    _solve_cache = LRUCache(maxsize=maxsize, ttl=ttl, path=path)
+    if path is not None and os.path.exists(path):
+        _solve_cache.load()
+
+
+def disable_solve_cache():
+    """Turns off memoization of `solve` results and discards the cached entries."""
+    global _solve_cache
+
+    _solve_cache = None
+
+
+def save_solve_cache(path=None):
+    """Writes the solve cache to `path`, or to the path given to `enable_solve_cache`."""
+    if _solve_cache is None:
+        raise RuntimeError("The solve cache is not enabled. Call enable_solve_cache() first.")
+    if path is None and _solve_cache.path is None:
+        raise ValueError("No path given and the solve cache was enabled without one.")
+    _solve_cache.save(path)
+
+
+def solve_cache_info():
+    """Returns the hits, misses and size of the solve cache, or `None` if it is disabled."""
+    return None if _solve_cache is None else _solve_cache.info()
+
+
+def _get_solve_cache():
+    return _solve_cache
+
+
+@atexit.register
+def _save_solve_cache_at_exit():
+    if _solve_cache is not None and _solve_cache.path is not None:
+        try:
+            _solve_cache.save()
+        except OSError:
+            pass
+
+
+def clear_caches():
+    """Empties all of casify's caches and resets their counters."""
+    _parse_cache.clear()
+    _model_cache.clear()
+    if _solve_cache is not None:
+        _solve_cache.clear()
@@ -1,137 +1,400 @@
 # import sympy
 # import sys
 
-from .printing import simplify_solution
+from .cache import _MISSING, _get_solve_cache, parse
+from .intervals import SolutionSet
+from .namespace import Namespace, function_names, main_namespace, resolve_functions
+from .numeric import find_roots
+from .printing import ast_simplify_inequalities, pretty, simplify_solution
+from .timeout import _mp_context, _preload, resolve_timeout, run_with_timeout
 
 
-def _get_func(expr):
-    import re
+def _handle_expression(expr, namespace=None):
+    return resolve_functions(parse(expr, function_names(namespace)), namespace)
 
-    match = re.match(r"(\w+)\((-?\w+|-?\d+)\)", expr.strip())
-    if match:
-        func_name, arg = match.groups()
-        return func_name, arg
-    else:
-        return False, False
-
-
-def _handle_expression(expr):
-    known_functions = [
-        "cos",
-        "sin",
-        "tan",
-        "exp",
-        "acos",
-        "asin",
-        "atan",
-        "log",
-        "log2",
-        "log10",
-    ]
-
-    func_name, arg = _get_func(expr)
-    if func_name:
-        if func_name in known_functions:
-            import sympy
 
-            return sympy.sympify(expr)
-        else:
-            import sys
+_SCAN_INTERVAL = (-10, 10)  # where single equations without a closed form are scanned for roots
 
-            main_module = sys.modules["__main__"]
-            main_globals = main_module.__dict__
-            func = main_globals.get(func_name)
 
-            return func(arg)
-    else:
-        import sympy
+def _solve_single_equation(eq, numerical=False, output="pretty", namespace=None):
+    return solve_expression(
+        _make_equation(eq, namespace), numerical=numerical, output=output
+    )
+
 
-        return sympy.sympify(expr)
+def solve_expression(expr, var=None, numerical=False, output="pretty", interval=None):
+    """Solves `expr = 0` for an already parsed expression.
 
+    This is what `solve` does for a single equation once it has been parsed, so callers that
+    hold a SymPy expression (such as `Function.zeros`) don't have to write it out as a string.
 
-def _solve_single_equation(eq, numerical=False):
+    Args:
+        expr (sympy.Expr): the left-hand side of `expr = 0`.
+        var (sympy.Symbol, optional): the variable to solve for. Defaults to the variable
+            SymPy picks, as for `solve`.
+        numerical (bool): return decimal approximations.
+        output (str): `"pretty"`, `"latex"`, `"raw"` or `"interval"`, as for `solve`.
+        interval (tuple, optional): `(a, b)` to only keep the roots in `[a, b]`. It is also
+            where roots are scanned for numerically if there is no symbolic solution, instead
+            of `[-10, 10]`.
+
+    Returns:
+        str, list or SolutionSet: the solutions, formatted according to `output`.
+
+    Examples:
+        >>> import sympy
+        >>> from casify.equation import solve_expression
+        >>> x = sympy.Symbol("x")
+        >>> solve_expression(x**2 - 4, x, output="raw")
+        [{x: -2}, {x: 2}]
+        >>> solve_expression(sympy.sin(x) - x / 5, x, numerical=True, interval=(-5, 5))
+        'x = -2.596 ∨ x = 0 ∨ x = 2.596'
+    """
     import sympy
 
-    eq = _make_equation(eq)
-    var = eq.free_symbols.pop()
-    solutions = sympy.solve(eq)
+    variables = [] if var is None else [var]
+    if var is None:
+        var = expr.free_symbols.pop()
+    a, b = _SCAN_INTERVAL if interval is None else interval
+
+    solutions = None
+    if expr.free_symbols == {var} and expr.is_polynomial(var):
+        solutions = _solve_polynomial(expr, var, numerical=numerical)
+
+    if solutions is None:
+        try:
+            solutions = sympy.solve(expr, *variables)
+        except NotImplementedError:
+            solutions = []
+
+    if solutions == [] and expr.free_symbols == {var}:
+        # No symbolic solution: scan for roots numerically, then try a single start value
+        solutions = [sympy.Float(root) for root in find_roots(expr, var, a, b)]
 
     if solutions == []:
+        # At 50 digits Newton's method only converges to actual roots, not along a tail
+        # that approaches zero (such as `exp(-x**2)`), so those attempts fail.
         try:
-            solutions = [sympy.nsolve(eq, 1)]
+            start = 1 if interval is None else (a + b) / 2
+            solutions = [sympy.Float(sympy.nsolve(expr, var, start, prec=50), 15)]
         except:
-            return "No solution"
+            solutions = []
+
+    solutions = [sol if isinstance(sol, dict) else {var: sol} for sol in solutions]
+    solutions = _real_solutions(solutions, numerical)
+
+    if interval is not None:
+        solutions = [
+            sol for sol in solutions if not sol[var].is_number or a <= sol[var] <= b
+        ]
+
+    if output == "interval":
+        return SolutionSet(sympy.FiniteSet(*[sol[var] for sol in solutions]), var)
+
+    return _format_solutions(solutions, output)
+
+
+def _solve_polynomial(expr, var, numerical=False):
+    """Finds the roots of a polynomial in one variable without going through `sympy.solve`.
+
+    Degrees up to 4 use the closed forms of `sympy.roots`, with trigonometric forms for cubics
+    with three real roots (their radical forms contain `I`). Higher degrees are solved as the
+    eigenvalues of the companion matrix (`numpy.roots`) of the square-free part if `numerical`
+    is set.
+
+    Args:
+        expr (sympy.Expr): the polynomial, as the left-hand side of `expr = 0`.
+        var (sympy.Symbol): the variable.
+        numerical (bool): whether approximate roots are acceptable.
+
+    Returns:
+        list or None: the distinct roots, possibly including complex ones, or `None` if the
+        general solver should be used instead.
+    """
+    import sympy
+
+    poly = sympy.Poly(expr, var)
+    degree = poly.degree()
+
+    if degree <= 0:
+        return []
+
+    if degree <= 4:
+        roots = sympy.roots(poly, multiple=True, trig=True)
+        if len(roots) < degree:  # not every root has a closed form
+            return None
+        return sorted(dict.fromkeys(roots), key=lambda root: complex(root.evalf()).real)
 
     if numerical:
-        solutions = [round(sol.evalf(), 3) for sol in solutions if "I" not in str(sol)]
+        import numpy
+
+        # The eigenvalues for a repeated root scatter around it (by about 1e-3 for a fivefold
+        # root), so they would be taken for complex roots. The square-free part has the same
+        # roots, each simple.
+        if poly.domain.is_ZZ or poly.domain.is_QQ:
+            poly = poly.sqf_part()
+        coefficients = [complex(c) for c in poly.all_coeffs()]
+        return sorted(
+            sympy.Float(root.real) for root in numpy.roots(coefficients) if _is_real(root)
+        )
+
+    return None
+
+
+def _is_real(value):
+    """Checks whether a solution is real by evaluating it.
+
+    Real roots can be written with complex radicals, so looking for `I` in the expression
+    isn't enough. Values that aren't numbers (such as `1 - y` in a system) count as real
+    unless they contain `I`.
+    """
+    import sympy
 
-    # Format each solution as "x = value"
-    formatted_sols = [
-        sympy.Eq(var, sympy.factor(sol)) for sol in solutions if "I" not in str(sol)
-    ]
-    formatted_sols = sympy.Or(*formatted_sols)
+    if isinstance(value, complex):
+        return abs(value.imag) <= 1e-12 * max(1.0, abs(value.real))
 
-    formatted_sols = sympy.factor(formatted_sols)
+    value = sympy.sympify(value)
+    if not value.is_number:
+        return not value.has(sympy.I)
 
-    return sympy.pretty(formatted_sols, use_unicode=True)
+    return _is_real(complex(value.evalf(30)))
 
 
-def _make_equation(eq):
+def _make_equation(eq, namespace=None):
 
     lhs, rhs = eq.split("=")
-    lhs = _handle_expression(lhs)
-    rhs = _handle_expression(rhs)
+    lhs = _handle_expression(lhs, namespace)
+    rhs = _handle_expression(rhs, namespace)
     return lhs - rhs
 
 
-def _solve_system_of_equations(*eqs, numerical=False):
+def _solve_system_of_equations(*eqs, numerical=False, output="pretty", namespace=None):
     import sympy
 
-    eqs = [_make_equation(eq) for eq in eqs]
+    eqs = [_make_equation(eq, namespace) for eq in eqs]
 
     # Get all variables from equations
     vars = list(set().union(*[eq.free_symbols for eq in eqs]))
     vars = sorted(vars, key=lambda x: str(x))
 
-    solutions = sympy.solve(eqs, vars, dict=True)
+    solutions = _solve_linear_system(eqs, vars, numerical)
+    if solutions is None:
+        solutions = sympy.solve(eqs, vars, dict=True)
+
+    return _format_solutions(_real_solutions(solutions, numerical), output)
+
+
+_SPARSE_MIN_SIZE = 100  # smallest float system handed to the sparse solver
+_SPARSE_MAX_DENSITY = 0.1  # largest share of nonzero coefficients for the sparse solver
+
+
+def _solve_linear_system(eqs, vars, numerical=False):
+    """Solves a system of linear equations without going through `sympy.solve`.
+
+    The system is written as `A x = b` with `sympy.linear_eq_to_matrix` and reduced exactly
+    with a sparse, fraction-free row reduction (`DomainMatrix.rref`), which also handles
+    systems with no or infinitely many solutions. If `numerical` is set, square systems with
+    a unique solution are solved in floating point instead, with `scipy.sparse` for large
+    sparse systems and `numpy.linalg` otherwise.
+
+    Args:
+        eqs (list): the equations, as expressions equal to zero.
+        vars (list): the variables, in the order to solve for them.
+        numerical (bool): whether approximate solutions are acceptable.
+
+    Returns:
+        list or None: the solution as a list with one dict (or no dict if the system is
+        inconsistent) like `sympy.solve(..., dict=True)` returns, or `None` if the system
+        isn't linear.
+    """
+    import sympy
+    from sympy.solvers.solveset import NonlinearError
+
+    if not all(isinstance(eq, sympy.Expr) for eq in eqs):
+        return None
+
+    try:
+        A, b = sympy.linear_eq_to_matrix(eqs, vars)
+    except NonlinearError:
+        return None
+
+    if numerical and A.is_square:
+        solution = _solve_linear_system_numerically(A, b)
+        if solution is not None:
+            return [dict(zip(vars, solution))]
+
+    from sympy.polys.matrices import DomainMatrix
+
+    augmented = DomainMatrix.from_Matrix(A.row_join(b)).to_sparse().to_field()
+    reduced, pivots = augmented.rref()
 
-    formatted_sols = []
+    n = len(vars)
+    if n in pivots:  # a row reads 0 = 1
+        return []
+
+    rational = augmented.domain.is_QQ
+    reduced = reduced.to_Matrix()
+    free = [j for j in range(n) if j not in pivots]
+    solution = {}
+    for row, pivot in enumerate(pivots):
+        value = reduced[row, n] - sum(reduced[row, j] * vars[j] for j in free)
+        # Rationalize denominators like 2/(1 + √2), as `sympy.solve` does
+        solution[vars[pivot]] = value if rational else sympy.radsimp(value)
+    return [solution]
+
+
+def _solve_linear_system_numerically(A, b):
+    """Solves the square system `A x = b` in floating point.
+
+    Returns:
+        list or None: the solution as `sympy.Float`s, or `None` if `A` is singular.
+    """
+    import numpy
+    import sympy
+
+    try:
+        A = numpy.array(A.tolist(), dtype=float)
+        b = numpy.array(b.tolist(), dtype=float).ravel()
+    except TypeError:  # complex or symbolic coefficients
+        return None
+
+    n = A.shape[0]
+    if n >= _SPARSE_MIN_SIZE and numpy.count_nonzero(A) <= _SPARSE_MAX_DENSITY * A.size:
+        import scipy.sparse
+        import scipy.sparse.linalg
+
+        with numpy.errstate(all="ignore"):
+            x = scipy.sparse.linalg.spsolve(scipy.sparse.csc_matrix(A), b)
+        if not numpy.all(numpy.isfinite(x)):
+            return None
+    else:
+        if numpy.linalg.cond(A) > 1 / numpy.finfo(float).eps:
+            return None
+        x = numpy.linalg.solve(A, b)
+
+    return [sympy.Float(value) for value in x]
+
+
+def _real_solutions(solutions, numerical=False):
+    """Discards complex solutions and rounds the rest to three decimals if `numerical` is set.
+
+    Args:
+        solutions (list): solutions as dicts mapping each variable to its value.
+        numerical (bool): whether to evaluate the values as rounded floats.
+
+    Returns:
+        list: the real solutions, as dicts.
+    """
+    import sympy
+
+    real_solutions = []
     for sol in solutions:
-        combined_sol = []  # Stores each solution of the system of equations
-        keep_sol = True
-        for var, val in sol.items():
+        # Check if the solution is complex and discard it if it is.
+        if not all(_is_real(val) for val in sol.values()):
+            continue
+        if numerical:
+            sol = {
+                var: round(sympy.re(val.evalf()), 3) if val.is_number else val.evalf()
+                for var, val in sol.items()
+            }
+        real_solutions.append(sol)
+
+    return real_solutions
+
+
+def _format_solutions(solutions, output="pretty"):
+    """Formats solutions as returned by `_real_solutions` according to `output`.
+
+    Factoring and rendering are only done for the string formats.
 
-            # Check if the solution is complex and discard it if it is.
-            if "I" in str(val):
-                keep_sol = False
-                break
-            else:
-                if numerical:
-                    val = round(val.evalf(), 3)
+    Args:
+        solutions (list): solutions as dicts mapping each variable to its value.
+        output (str): `"pretty"`, `"latex"` or `"raw"`. `"interval"` is rejected, since
+            it only applies to a single variable.
 
-                combined_sol.append(sympy.Eq(var, sympy.factor(val)))
+    Returns:
+        str or list: the rendered solutions, `"No solution"` if there are none, or the
+        dicts themselves if `output` is `"raw"`.
+    """
+    import sympy
 
-        if keep_sol:
-            combined_sol = sympy.And(*combined_sol)
-            formatted_sols.append(combined_sol)
+    if output == "raw":
+        return solutions
 
-    formatted_sols = sympy.Or(*formatted_sols)
+    if output == "interval":
+        raise ValueError('output="interval" is only supported for a single variable')
 
-    if sympy.pretty(formatted_sols, use_unicode=True) == "False":
+    if not solutions:
         return "No solution"
-    else:
-        return sympy.pretty(formatted_sols, use_unicode=True)
+
+    # Format each solution as "x = value", and combine them as "x = a ∧ y = b ∨ ..."
+    formatted_sols = sympy.Or(
+        *[
+            sympy.And(*[sympy.Eq(var, sympy.factor(val)) for var, val in sol.items()])
+            for sol in solutions
+        ]
+    )
+
+    if output == "latex":
+        return sympy.latex(formatted_sols)
+    return pretty(formatted_sols, use_unicode=True)
+
+
+def _split_inequality(eq):
+    """Splits an inequality string into `(lhs, sign, rhs)`, or returns `None` for equations."""
+    for sign in [">=", "<=", ">", "<"]:
+        if sign in eq:
+            lhs, rhs = eq.split(sign)
+            return lhs, sign, rhs
+    return None
+
+
+def _canonical_key(eqs, *options, namespace=None):
+    """Builds a cache key for `solve` that doesn't depend on how the equations are written.
+
+    Each equation is reduced to `lhs - rhs` (with its sign fixed, since `e = 0` and `-e = 0`
+    have the same solutions), inequalities are rewritten to use `<` or `<=`, and the equations
+    of a system are sorted. Calls of user functions are resolved first, so the key changes
+    with the functions.
+    """
+    import sympy
+
+    canonical = []
+    for eq in eqs:
+        inequality = _split_inequality(eq)
+        if inequality is not None:
+            lhs, sign, rhs = inequality
+            lhs = _handle_expression(lhs, namespace)
+            rhs = _handle_expression(rhs, namespace)
+            if sign in [">", ">="]:
+                lhs, rhs = rhs, lhs
+                sign = sign.replace(">", "<")
+            canonical.append((sign, sympy.srepr(lhs - rhs)))
+        else:
+            expr = _make_equation(eq, namespace)
+            canonical.append(("=", min(sympy.srepr(expr), sympy.srepr(-expr))))
+
+    return (tuple(sorted(canonical)),) + options
 
 
-def solve(*eqs, numerical=False):
+def solve(*eqs, numerical=False, output="pretty", timeout=None, namespace=None):
     """Solves an equation or a set of equations or inequalities.
 
+    Results are memoized if the solve cache is turned on with `casify.enable_solve_cache()`.
+
     Args:
         *equations (str): a variable number of strings representing equations or inequalities.
-        pprint (bool): Gives a mathematical-like output. Defaults to `True`.
+        numerical (bool): Rounds the solutions to three decimals. Defaults to `False`.
+        output (str): `"pretty"` gives a mathematical-like string, `"latex"` a LaTeX string and `"raw"` the unformatted SymPy solutions, which skips the rendering. `"interval"` gives a `SolutionSet` of intervals for a single equation or inequality in one variable. Defaults to `"pretty"`.
+        timeout (float, optional): Seconds to allow before the computation is killed. Defaults to the limit set with `casify.set_default_timeout`, which is no limit unless changed.
+        namespace (Namespace or dict, optional): the functions that calls such as `f(1)` in the equations refer to. Defaults to the `Function` objects defined in `__main__`.
 
     Returns:
-        str or list: A string representation of the solutions if pprint is True, otherwise a list of dictionaries containing the solutions. Return "No solution" if no real solutions are found.
+        str or list: A string representation of the solutions, or with `output="raw"` a list of dictionaries mapping each variable to its value (the solution set as a SymPy boolean for inequalities). Return "No solution" (or `[]`) if no real solutions are found.
+
+    Raises:
+        CasifyTimeout: if solving takes longer than `timeout` seconds.
+        NameError: if an equation calls a function that can't be found.
 
     Examples:
         >>> from casify import *
@@ -142,61 +405,254 @@ def solve(*eqs, numerical=False):
         >>> f = function("a * x**2 + b*x + c")
         >>> solve("f(1) = 2", "f(-1) = 3", "f(3) = 4")
         'a = 3/8 ∧ b = -1/2 ∧ c = 17/8'
+        >>> solve("g(1) = 2", "g(2) = 3", namespace={"g": "a*x + b"})
+        'a = 1 ∧ b = 1'
+        >>> solve("x**2 - x - 6 = 0", output="raw")
+        [{x: -2}, {x: 3}]
 
     """
+    return _cached_solve(
+        eqs, numerical, output, timeout=resolve_timeout(timeout), namespace=namespace
+    )
+
+
+def _cached_solve(eqs, numerical, output, timeout=None, namespace=None):
+    if namespace is None and timeout is not None:
+        # The process solving with a time limit might not be forked from this one.
+        namespace = main_namespace()
+    namespace = Namespace.of(namespace)
+    cache = _get_solve_cache()
+    if cache is None:
+        return run_with_timeout(
+            _solve,
+            *eqs,
+            numerical=numerical,
+            output=output,
+            namespace=namespace,
+            timeout=timeout,
+        )
+
+    key = _canonical_key(eqs, numerical, output, namespace=namespace)
+    solution = cache.get(key, _MISSING)
+    if solution is _MISSING:
+        solution = run_with_timeout(
+            _solve,
+            *eqs,
+            numerical=numerical,
+            output=output,
+            namespace=namespace,
+            timeout=timeout,
+        )
+        cache.set(key, solution)
+    if isinstance(solution, list):
+        # Hand out copies so callers can't modify the cached dicts.
+        solution = [dict(sol) for sol in solution]
+    return solution
+
+
+def _solve(*eqs, numerical=False, output="pretty", namespace=None):
+    if output not in ["pretty", "latex", "raw", "interval"]:
+        raise ValueError(
+            f'output must be "pretty", "latex", "raw" or "interval", not {output!r}'
+        )
 
     # Check it it is a single equation
     if len(eqs) == 1:
         eq = eqs[0]
+        inequality = _split_inequality(eq)
         # If the equation is an inequality:
-        if any(op in eq for op in [">=", "<=", ">", "<"]):
-
-            if ">=" in eq:
-                lhs, rhs = eq.split(">=")
-                sign = ">="
-
-            elif "<=" in eq:
-                lhs, rhs = eq.split("<=")
-                sign = "<="
+        if inequality is not None:
+            lhs, sign, rhs = inequality
 
-            elif ">" in eq:
-                lhs, rhs = eq.split(">")
-                sign = ">"
-
-            elif "<" in eq:
-                lhs, rhs = eq.split("<")
-                sign = "<"
+            import sympy
 
-            lhs = _handle_expression(lhs)
-            rhs = _handle_expression(rhs)
-            eq = " ".join([str(lhs), sign, str(rhs)])
+            lhs = _handle_expression(lhs, namespace)
+            rhs = _handle_expression(rhs, namespace)
 
-            return _solve_inequality(eq)
+            return _solve_inequality(sympy.Rel(lhs, rhs, sign), output=output)
 
         # Or if it is a onevariable single equation
         else:
-            return _solve_single_equation(eq, numerical=numerical)
+            return _solve_single_equation(
+                eq, numerical=numerical, output=output, namespace=namespace
+            )
 
     # Else solve a system of equations
     else:
-        return _solve_system_of_equations(*eqs, numerical=numerical)
+        return _solve_system_of_equations(
+            *eqs, numerical=numerical, output=output, namespace=namespace
+        )
 
 
-def Solve(*eqs):
+def Solve(*eqs, numerical=False, output="pretty", timeout=None, namespace=None):
     """Alternative way to write `solve`."""
-    return solve(*eqs)
+    return solve(
+        *eqs, numerical=numerical, output=output, timeout=timeout, namespace=namespace
+    )
+
+
+async def asolve(
+    *eqs,
+    numerical=False,
+    output="pretty",
+    timeout=None,
+    namespace=None,
+    executor=None,
+):
+    """Solves like `solve`, without blocking the event loop.
+
+    The work is run in `executor`, so an async service can await solutions while it keeps
+    serving other requests. SymPy holds the GIL while it computes, so with a thread pool the
+    solves don't run in parallel; pass a `timeout` (the solve then runs in its own process)
+    or a `concurrent.futures.ProcessPoolExecutor` for that.
 
+    Args:
+        *eqs (str): the equations or inequalities, as for `solve`.
+        numerical (bool): passed on to `solve`.
+        output (str): passed on to `solve`.
+        timeout (float, optional): passed on to `solve`.
+        namespace (Namespace or dict, optional): passed on to `solve`.
+        executor (concurrent.futures.Executor, optional): where to run the solve. Defaults to
+            the event loop's default thread pool.
 
-def nsolve(eq, start_value=1):
+    Returns:
+        str or list: the solution, as `solve` returns it.
+
+    Examples:
+        >>> import asyncio
+        >>> from casify import *
+        >>> asyncio.run(asolve("x**2 - x - 6 = 0"))
+        'x = -2 ∨ x = 3'
+    """
+    import asyncio
+    import functools
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor,
+        functools.partial(
+            solve,
+            *eqs,
+            numerical=numerical,
+            output=output,
+            timeout=timeout,
+            namespace=namespace,
+        ),
+    )
+
+
+def _solve_item(eqs, numerical=False, output="pretty", timeout=None, namespace=None):
+    """Solves one item of `solve_many`, returning any exception raised instead of raising it.
+
+    In the pool workers, which have imported everything in their initializer, the time limit
+    is enforced with `SIGALRM`; in the calling process (`workers=1`) the item is solved in a
+    process that can be killed, since an exception raised at an arbitrary point (an import,
+    a lock) could leave the caller's interpreter broken.
+    """
+    try:
+        return _cached_solve(eqs, numerical, output, timeout=timeout, namespace=namespace)
+    except Exception as exc:
+        return exc
+
+
+def solve_many(
+    equations,
+    workers=None,
+    chunksize=1,
+    timeout=None,
+    numerical=False,
+    output="pretty",
+    namespace=None,
+):
+    """Solves many independent equations, systems or inequalities in a pool of processes.
+
+    Results are yielded in input order as soon as they are ready, so the whole batch is
+    never held in memory. An item that raises, or runs longer than `timeout`, yields the
+    exception (a `CasifyTimeout` for timeouts) in its place instead of stopping the batch.
+
+    Args:
+        equations (iterable): equations as strings, or systems as tuples or lists of strings.
+        workers (int, optional): number of processes. Defaults to the number of CPUs. With
+            `workers=1` the items are solved one by one from the calling process.
+        chunksize (int): number of items sent to a process at a time. Larger chunks cut the
+            overhead for many small equations. Defaults to `1`.
+        timeout (float, optional): seconds allowed per item. Defaults to the limit set with
+            `casify.set_default_timeout`. The workers enforce it with `SIGALRM`, so only on
+            POSIX systems; with `workers=1` each item runs in a process that is killed once
+            its time is up, as for `solve`.
+        numerical (bool): passed on to `solve`.
+        output (str): passed on to `solve`.
+        namespace (Namespace or dict, optional): passed on to `solve`. It is sent to the
+            worker processes, so its functions must be picklable.
+
+    Yields:
+        str, list or Exception: the solution of each item, as `solve` would return it.
+
+    Examples:
+        >>> from casify import *
+        >>> list(solve_many(["x**2 = 4", ("x + y = 2", "x - y = 0")], workers=2))
+        ['x = -2 ∨ x = 2', 'x = 1 ∧ y = 1']
+    """
+    import functools
+    import signal
+    import warnings
+
+    timeout = resolve_timeout(timeout)
+    if timeout is not None and workers != 1 and not hasattr(signal, "SIGALRM"):
+        warnings.warn("Timeouts in solve_many are only supported on POSIX systems; ignoring.")
+
+    items = ((eq,) if isinstance(eq, str) else tuple(eq) for eq in equations)
+    task = functools.partial(
+        _solve_item,
+        numerical=numerical,
+        output=output,
+        timeout=timeout,
+        namespace=Namespace.of(namespace),
+    )
+
+    if workers == 1:
+        for item in items:
+            yield task(item)
+        return
+
+    with _mp_context().Pool(workers, initializer=_preload) as pool:
+        yield from pool.imap(task, items, chunksize=chunksize)
+
+
+def nsolve(eq, start_value=1, interval=None, timeout=None):
+    """Solves an equation numerically.
+
+    Args:
+        eq (str): the equation.
+        start_value (float): where Newton's method starts looking for a root. Defaults to `1`.
+        interval (tuple, optional): `(a, b)` to find every real root in `[a, b]` instead of the
+            one closest to `start_value`. The equation must then have a single variable.
+        timeout (float, optional): seconds to allow before the computation is killed.
+
+    Returns:
+        str: the root(s), rounded to three decimals.
+
+    Examples:
+        >>> from casify import *
+        >>> nsolve("cos(x) = x")
+        'x = 0.739'
+        >>> nsolve("sin(x) = 0.5", interval=(0, 10))
+        'x = 0.524 ∨ x = 2.618 ∨ x = 6.807 ∨ x = 8.901'
+    """
     import sympy
 
     eq = _make_equation(eq)
-    solution = sympy.nsolve(eq, start_value)
+    if interval is not None:
+        return _nsolve_interval(eq, interval, timeout=timeout)
+
+    solution = run_with_timeout(
+        sympy.nsolve, eq, start_value, timeout=resolve_timeout(timeout)
+    )
     try:
         solution = round(solution, 3)
         var = eq.free_symbols.pop()
         s = sympy.Eq(var, solution)
-        s = sympy.pretty(s, use_unicode=True)
+        s = pretty(s, use_unicode=True)
 
         return s
 
@@ -206,11 +662,48 @@ def nsolve(eq, start_value=1):
         )
 
 
-def _solve_inequality(expr):
+def _nsolve_interval(eq, interval, timeout=None):
     import sympy
 
-    solution = sympy.solve(expr)
+    if len(eq.free_symbols) != 1:
+        raise ValueError(
+            "Can only search an interval for the roots of an equation in one variable, "
+            f"not {len(eq.free_symbols)} ({eq} = 0)"
+        )
+    var = next(iter(eq.free_symbols))
+    a, b = interval
+    roots = run_with_timeout(find_roots, eq, var, a, b, timeout=resolve_timeout(timeout))
+
+    return _format_solutions([{var: round(sympy.Float(root), 3)} for root in roots])
+
+
+def _solve_inequality(inequality, output="pretty"):
+    """Solves an inequality given as a SymPy relational.
 
-    solution = simplify_solution(solution)
+    Univariate inequalities are passed to `sympy.reduce_inequalities` with their variable,
+    which dispatches polynomial and rational ones to the specialised rational-inequality solver
+    and the rest to the general univariate one. An inequality without variables has already
+    evaluated to true or false when it was built.
+    """
+    import sympy
+
+    if isinstance(inequality, sympy.logic.boolalg.BooleanAtom):
+        solution = inequality
+    else:
+        solution = sympy.reduce_inequalities(inequality, list(inequality.free_symbols))
+
+    if output == "raw":
+        return ast_simplify_inequalities(solution)
+    elif output == "latex":
+        return sympy.latex(ast_simplify_inequalities(solution))
+    elif output == "interval":
+        if len(inequality.free_symbols) > 1:
+            raise ValueError('output="interval" is only supported for a single variable')
+        # An inequality without variables ("1 < 2", "x > x") holds for every x or none.
+        (var,) = inequality.free_symbols or {sympy.Symbol("x")}
+        return SolutionSet.from_relational(ast_simplify_inequalities(solution), var)
+
+    variables = inequality.free_symbols
+    solution = simplify_solution(solution, variables.pop() if len(variables) == 1 else None)
 
     return solution
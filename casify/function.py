@@ -1,6 +1,12 @@
 # import sympy
 
-from .equation import solve
+from .cache import parse
+from .equation import solve_expression
+from .numeric import find_roots, lambdify, quad, real_diff
+from .printing import pretty
+from .rendering import finish
+from .sampling import sample, value_range
+from .timeout import CasifyTimeout, resolve_timeout, run_with_timeout
 
 
 class Function:
@@ -10,8 +16,9 @@ class Function:
         f (str): A string representing the function expression.
 
     Methods:
-        __call__(x): Evaluates the function at a given value of x.
-        derivative(x=None, order=1): Computes the derivative of the function.
+        __call__(x): Evaluates the function at a value of x, or at every value in a list, tuple or ndarray.
+        derivative(x=None, order=1): Computes the derivative of the function, or its value at x or at every value in a list, tuple or ndarray.
+        integral(a=None, b=None): Computes an antiderivative, or the integral from a to b. With lists, tuples or ndarrays of bounds, computes every integral as an ndarray.
         factor(): Factors the function expression.
         expand(): Expands the function expression.
         plot(domain=None): Plots the function within the specified domain.
@@ -23,6 +30,10 @@ class Function:
         9
         >>> f.derivative()
         2*x + 2
+        >>> f.derivative([0, 1, 2])
+        array([2., 4., 6.])
+        >>> f.integral(0, [1, 2, 3])
+        array([ 2.33333333,  8.66666667, 21.        ])
         >>> f.factor()
         (x + 1)**2
         >>> g = Function("(x + 1) * (x - 3)")
@@ -43,20 +54,55 @@ class Function:
     ]
 
     def __init__(self, f_expr):
-        import sympy
-
-        self._f_expr = sympy.sympify(f_expr)
+        self._f_expr = parse(f_expr)
+        self._numpy_func = None
+        # Memos of symbolic results and their compiled callables, filled in on first use.
+        self._derivatives = {}
+        self._derivative_funcs = {}
+        self._antiderivative = None
+        self._antiderivative_func = None
 
     def __call__(self, x):
+        import numpy
+
+        if isinstance(x, (list, tuple, numpy.ndarray)):
+            return self._numeric()(x)
         return self._f_expr.subs("x", x)
 
+    def __getstate__(self):
+        # Compiled callables can't be pickled; they are rebuilt on demand.
+        state = self.__dict__.copy()
+        state["_numpy_func"] = None
+        state["_derivative_funcs"] = {}
+        state["_antiderivative_func"] = None
+        return state
+
+    def _numeric(self):
+        """Returns f(x) compiled to a vectorized NumPy callable, compiling it on first use."""
+        if self._numpy_func is None:
+            self._numpy_func = lambdify(self._f_expr)
+        return self._numpy_func
+
+    def _derivative(self, order):
+        """Returns the derivative of the given order, differentiating only the first time."""
+        if order not in self._derivatives:
+            self._derivatives[order] = real_diff(self._f_expr, "x", order)
+        return self._derivatives[order]
+
+    def _numeric_derivative(self, order):
+        """Returns the derivative of the given order compiled to a vectorized NumPy callable."""
+        if order not in self._derivative_funcs:
+            self._derivative_funcs[order] = lambdify(self._derivative(order))
+        return self._derivative_funcs[order]
+
     def derivative(self, x=None, order=1):
-        import sympy
+        import numpy
 
-        if x is not None:
-            return sympy.diff(self._f_expr, "x", order).subs("x", x)
-        else:
-            return sympy.diff(self._f_expr, "x", order)
+        if x is None:
+            return self._derivative(order)
+        if isinstance(x, (list, tuple, numpy.ndarray)):
+            return self._numeric_derivative(order)(x)
+        return self._derivative(order).subs("x", x)
 
     def factor(self):
         import sympy
@@ -68,36 +114,406 @@ class Function:
 
         return sympy.expand(self._f_expr)
 
-    def zeros(self):
-        equation = " ".join([str(self._f_expr), "=", "0"])
-        return solve(equation)
+    def zeros(self, output="pretty", domain=None, numerical=False):
+        """Finds the zeros of f.
+
+        Args:
+            output (str): `"pretty"` or `"latex"` for a rendered string, `"raw"` for a list
+                of dicts such as `[{x: -1}, {x: 3}]`, or `"interval"` for a `SolutionSet`.
+            domain (tuple, optional): `(a, b)` to only return the zeros in `[a, b]`. If f has
+                no symbolic zeros, this is also where they are searched for numerically
+                (`[-10, 10]` by default).
+            numerical (bool): return decimal approximations.
+
+        Returns:
+            str, list or SolutionSet: the zeros, formatted according to `output`.
+
+        Examples:
+            >>> from casify import *
+            >>> f = Function("x**2 - 2*x - 3")
+            >>> f.zeros()
+            'x = -1 ∨ x = 3'
+            >>> f.zeros(output="raw", domain=(0, 5))
+            [{x: 3}]
+        """
+        import sympy
+
+        return solve_expression(
+            self._f_expr,
+            sympy.Symbol("x"),
+            numerical=numerical,
+            output=output,
+            interval=domain,
+        )
 
-    def extrema(self):
-        derivative = self.derivative()
-        equation = " ".join([str(derivative), "=", "0"])
-        return solve(equation)
+    def extrema(self, output="pretty", domain=None, numerical=False):
+        """Finds the critical points of f, where `f'(x) = 0`.
 
-    def integral(self, a=None, b=None):
+        Takes the same arguments as `zeros`, and uses the derivative memoized by `derivative`.
+
+        Examples:
+            >>> from casify import *
+            >>> Function("x**3 - 3*x").extrema(output="raw")
+            [{x: -1}, {x: 1}]
+        """
         import sympy
 
-        if a == "inf":
-            a = sympy.oo
-        elif a == "-inf":
-            a = -sympy.oo
-        if b == "inf":
-            b = sympy.oo
-        elif b == "-inf":
-            b = -sympy.oo
-
-        x = sympy.sympify("x")
-        if a is not None and b is None:
-            return sympy.integrate(self._f_expr, (x, a, x))
-        elif a is None and b is not None:
-            return sympy.integrate(self._f_expr, (x, x, b))
-        elif a is not None and b is not None:
-            return sympy.integrate(self._f_expr, (x, a, b))
+        return solve_expression(
+            self._derivative(1),
+            sympy.Symbol("x"),
+            numerical=numerical,
+            output=output,
+            interval=domain,
+        )
+
+    def analyze(self, domain=None):
+        """Analyzes f: zeros, extrema, inflection points, asymptotes, monotonicity and sign.
+
+        Everything is derived from three solves (of f, f' and f'' equal to zero) and from the
+        points where f is undefined, using the memoized derivatives. Signs on each interval
+        are found by evaluating the compiled functions at one point inside it, and extrema
+        and inflection points are classified by how the signs change around them.
+
+        Args:
+            domain (tuple, optional): `(a, b)` to analyze f on `[a, b]` only. Defaults to
+                the whole real line.
+
+        Returns:
+            dict: the report, made of strings, lists and dicts only, so it can be passed to
+            `json.dumps`. Values are written as SymPy expressions (`"sqrt(3)"`, `"-oo"`).
+            Signs are `"positive"` or `"negative"`, trends `"increasing"`, `"decreasing"` or
+            `"constant"`, and both are `None` where f is undefined.
+
+        Raises:
+            ValueError: if `domain` is not given and the zeros of f, f' or f'' (or the points
+                where f is undefined) can't all be listed, as for periodic functions.
+
+        Examples:
+            >>> from casify import *
+            >>> report = Function("x**3 - 3*x").analyze()
+            >>> report["zeros"]
+            ['-sqrt(3)', '0', 'sqrt(3)']
+            >>> report["extrema"]
+            [{'x': '-1', 'y': '2', 'kind': 'maximum'}, {'x': '1', 'y': '-2', 'kind': 'minimum'}]
+            >>> report["monotonicity"][0]
+            {'start': '-oo', 'end': '-1', 'trend': 'increasing'}
+        """
+        import sympy
+        from sympy.calculus.util import continuous_domain
+
+        x = sympy.Symbol("x")
+        f, f1, f2 = self._f_expr, self._derivative(1), self._derivative(2)
+        interval = sympy.S.Reals if domain is None else sympy.Interval(*domain)
+
+        # Where f is defined and continuous, and the points inside `interval` where it stops
+        # being so. These split the sign tables, but those f is defined at (0 for sqrt(x))
+        # aren't reported as undefined. If there are infinitely many, the zeros of the
+        # denominator are used, which on the real line raises for periodic functions such as
+        # tan(x).
+        defined = continuous_domain(f, x, interval)
+        try:
+            boundary = defined.boundary
+        except NotImplementedError:
+            boundary = None
+        if isinstance(boundary, sympy.FiniteSet):
+            edges = sorted(
+                (point for point in boundary if point not in interval.boundary), key=float
+            )
         else:
-            return sympy.integrate(self._f_expr, x)
+            edges = self._roots(sympy.fraction(sympy.together(f))[1], domain)
+        undefined = [point for point in edges if defined.contains(point) != sympy.true]
+
+        def roots(expr):
+            return [point for point in self._roots(expr, domain) if _may_contain(defined, point)]
+
+        zeros = roots(f)
+        critical = roots(f1)
+        candidates = roots(f2)
+
+        sign = _signs(self._numeric(), _partition(zeros + edges, domain), defined)
+        trend = _signs(
+            self._numeric_derivative(1), _partition(critical + edges, domain), defined
+        )
+        concavity = _signs(
+            self._numeric_derivative(2), _partition(candidates + edges, domain), defined
+        )
+
+        extrema = []
+        for point in critical:
+            left, right = _around(point, trend)
+            if left is not None and right is not None:
+                kind = {(1, -1): "maximum", (-1, 1): "minimum"}.get((left, right), "saddle")
+            else:
+                curvature = float(self._numeric_derivative(2)(float(point)))
+                kind = "minimum" if curvature > 0 else "maximum" if curvature < 0 else None
+            extrema.append({"x": str(point), "y": str(_value_at(f, point)), "kind": kind})
+
+        inflection_points = []
+        for point in candidates:
+            left, right = _around(point, concavity)
+            if left is not None and right is not None and left * right < 0:
+                inflection_points.append({"x": str(point), "y": str(_value_at(f, point))})
+
+        horizontal, oblique = [], []
+        if f.is_rational_function(x):
+            poles, line, slope = _rational_asymptotes(f)
+            # `continuous_domain` gives Floats where the poles are Rationals (0.5 and 1/2).
+            vertical = [
+                point
+                for point in undefined
+                if any(
+                    abs(float(point) - float(pole)) <= 1e-9 * max(1.0, abs(float(pole)))
+                    for pole in poles
+                )
+            ]
+            if domain is None:
+                horizontal = [] if line is None else [line]
+                oblique = [] if slope is None else [slope]
+        else:
+            vertical = [point for point in undefined if _is_pole(f, point, defined)]
+            if domain is None:
+                for end in (-sympy.oo, sympy.oo):
+                    limit = sympy.limit(f, x, end)
+                    if limit.is_real and limit.is_finite and limit not in horizontal:
+                        horizontal.append(limit)
+
+        return {
+            "function": str(f),
+            "domain": None if domain is None else [str(bound) for bound in domain],
+            "derivative": str(f1),
+            "second_derivative": str(f2),
+            "zeros": [str(point) for point in zeros],
+            "undefined": [str(point) for point in undefined],
+            "extrema": extrema,
+            "inflection_points": inflection_points,
+            "asymptotes": {
+                "vertical": [str(point) for point in vertical],
+                "horizontal": [str(line) for line in horizontal],
+                "oblique": [str(line) for line in oblique],
+            },
+            "monotonicity": [
+                {"start": str(start), "end": str(end), "trend": _TRENDS[value]}
+                for start, end, value in trend
+            ],
+            "sign": [
+                {"start": str(start), "end": str(end), "sign": _SIGNS[value]}
+                for start, end, value in sign
+            ],
+        }
+
+    def _roots(self, expr, domain=None):
+        """Returns the real solutions of `expr = 0` in `domain`, in increasing order.
+
+        `expr` is first written as one fraction and cancelled, so expressions that are
+        identically zero (as the second derivative of `(x**2 - 1)/(x - 1)` is) have no roots
+        rather than the rounding noise a numeric search would find.
+        """
+        import sympy
+
+        x = sympy.Symbol("x")
+        numerator, _ = sympy.fraction(sympy.cancel(sympy.together(expr)))
+        if not numerator.has(x):
+            return []
+
+        # `solveset` lists every root of periodic functions, where `solve` only gives those in
+        # one period. On the real line, any other answer may leave roots out.
+        interval = sympy.S.Reals if domain is None else sympy.Interval(*domain)
+        roots = sympy.solveset(numerator, x, interval)
+        if roots is sympy.S.EmptySet:
+            roots = []
+        elif isinstance(roots, sympy.FiniteSet):
+            roots = list(roots)
+        elif domain is None:
+            raise ValueError(
+                f"Can't list every real solution of {numerator} = 0 (got {roots}). "
+                "Pass domain=(a, b) to analyze the function on an interval."
+            )
+        else:
+            solutions = solve_expression(numerator, x, output="raw", interval=domain)
+            roots = [sol[x] for sol in solutions if sol[x].is_real]
+
+        if domain is not None:
+            # SymPy misses some roots of transcendental equations (the second one of
+            # `exp(x) = 3*x`), so a numeric scan of the domain adds any it finds.
+            known = [float(root) for root in roots]
+            for root in find_roots(numerator, x, *domain):
+                if all(abs(root - other) > 1e-9 * max(1.0, abs(root)) for other in known):
+                    roots.append(sympy.Float(root))
+
+        return sorted(roots, key=float)
+
+    def _antiderivative_expr(self, timeout=None):
+        """Returns an antiderivative of f, integrating only the first time."""
+        if self._antiderivative is None:
+            self._antiderivative = run_with_timeout(
+                _integrate, self._f_expr, timeout=resolve_timeout(timeout)
+            )
+        return self._antiderivative
+
+    def _numeric_antiderivative(self, timeout=None):
+        """Returns the antiderivative compiled to a NumPy callable that accepts complex arrays.
+
+        Antiderivatives of rational functions contain terms such as `log(x - 3)`, which are
+        complex left of the pole. Differences on the same side of a pole are still real.
+        """
+        if self._antiderivative_func is None:
+            import sympy
+
+            self._antiderivative_func = sympy.lambdify(
+                sympy.Symbol("x"), self._antiderivative_expr(timeout), ["scipy", "numpy"]
+            )
+        return self._antiderivative_func
+
+    def integral(self, a=None, b=None, timeout=None, method="symbolic"):
+        """Integrates f with respect to `x`.
+
+        Args:
+            a (float, str or array, optional): lower bound. `"inf"` and `"-inf"` are accepted.
+            b (float, str or array, optional): upper bound. With only one bound, the other is `x`.
+            timeout (float, optional): seconds allowed for symbolic integration. Defaults to
+                the limit set with `casify.set_default_timeout`; with `method="auto"`, to
+                two seconds if no limit is set.
+            method (str): `"symbolic"` integrates with SymPy. `"numeric"` uses adaptive
+                quadrature and needs both bounds. `"auto"` tries symbolic integration within
+                `timeout` and falls back to quadrature if it runs out of time or finds no
+                closed form. Like every time limit, that one applies to a separate process
+                and doesn't count its start-up. Defaults to `"symbolic"`.
+
+        Returns:
+            sympy.Expr, Estimate or numpy.ndarray: the exact integral, or a float with an
+            `error` estimate if it was computed numerically. Arrays of bounds give an array
+            of integrals (see `_integrals`), whatever the method.
+
+        Raises:
+            CasifyTimeout: if symbolic integration takes longer than `timeout`, unless
+                `method="auto"` can fall back to quadrature.
+        """
+        import numpy
+
+        if method not in ["symbolic", "numeric", "auto"]:
+            raise ValueError(
+                f'method must be "symbolic", "numeric" or "auto", not {method!r}'
+            )
+
+        if isinstance(a, (list, tuple, numpy.ndarray)) or isinstance(
+            b, (list, tuple, numpy.ndarray)
+        ):
+            return self._integrals(a, b, timeout)
+
+        if method == "numeric":
+            return self._quad(a, b)
+
+        if method == "auto":
+            import sympy
+
+            budget = resolve_timeout(timeout)
+            budget = _AUTO_BUDGET if budget is None else budget
+            definite = a is not None and b is not None
+            try:
+                result = self._symbolic_integral(a, b, budget)
+            except CasifyTimeout:
+                if not definite:
+                    raise
+                return self._quad(a, b)
+            if definite and result.has(sympy.Integral):
+                return self._quad(a, b)
+            return result
+
+        return self._symbolic_integral(a, b, timeout)
+
+    def _quad(self, a, b):
+        """Integrates f from `a` to `b` numerically."""
+        if a is None or b is None:
+            raise ValueError("Numeric integration needs both bounds")
+        if self._f_expr.free_symbols - {parse("x")}:
+            raise ValueError("Can only integrate numerically if x is the only variable")
+        return quad(self._numeric(), _float_bound(a), _float_bound(b))
+
+    def _symbolic_integral(self, a=None, b=None, timeout=None):
+        if a is None and b is None:
+            return self._antiderivative_expr(timeout)
+
+        if _has_continuous_antiderivative(self._f_expr, a, b):
+            import sympy
+
+            F = self._antiderivative_expr(timeout)
+            # Without a closed form, `F(b) - F(a)` is a difference of two unevaluated
+            # integrals; SymPy handles the definite integral better as one.
+            if not F.has(sympy.Integral):
+                x = sympy.Symbol("x")
+                return F.subs(x, b) - F.subs(x, a)
+
+        return run_with_timeout(
+            _integrate, self._f_expr, a, b, timeout=resolve_timeout(timeout)
+        )
+
+    def _integrals(self, a, b, timeout=None):
+        """Computes the integrals from each `a` to each `b` as an ndarray of floats.
+
+        Where the cached antiderivative `F` is valid on an interval (see `_antiderivative_kind`),
+        the integral is `F(b) - F(a)` evaluated for all intervals at once. The other intervals
+        are integrated numerically together with `scipy.integrate.quad_vec`, after mapping
+        each of them onto `[0, 1]`. Integrals across a pole of a rational function are `nan`,
+        and those over zero-width intervals are `0`.
+        """
+        import numpy
+        import scipy.integrate
+        import sympy
+
+        if self._f_expr.free_symbols - {parse("x")}:
+            raise ValueError("Can only integrate over arrays of bounds if x is the only variable")
+
+        a, b = numpy.broadcast_arrays(
+            numpy.asarray(a, dtype=float), numpy.asarray(b, dtype=float)
+        )
+        results = numpy.full(a.shape, numpy.nan)
+        # Zero-width intervals integrate to 0, even at points where f is undefined.
+        empty = a == b
+        results[empty] = 0.0
+        finite = numpy.isfinite(a) & numpy.isfinite(b) & ~empty
+        divergent = numpy.zeros(a.shape, dtype=bool)
+
+        kind = _antiderivative_kind(self._f_expr)
+        exact = finite.copy() if kind is not None else numpy.zeros(a.shape, dtype=bool)
+        if kind == "rational":
+            lower, upper = numpy.minimum(a, b), numpy.maximum(a, b)
+            for pole in _real_poles(self._f_expr):
+                divergent |= (lower <= pole) & (pole <= upper)
+            exact &= ~divergent
+
+        if exact.any() and self._antiderivative_expr(timeout).has(sympy.Integral):
+            exact[:] = False  # SymPy found no closed form
+
+        if exact.any():
+            F = self._numeric_antiderivative(timeout)
+            try:
+                with numpy.errstate(all="ignore"):
+                    values = F(b[exact].astype(complex)) - F(a[exact].astype(complex))
+                results[exact] = numpy.broadcast_to(numpy.real(values), results[exact].shape)
+            except (TypeError, NameError):  # F uses functions NumPy and SciPy can't evaluate
+                exact[:] = False
+
+        numerical = finite & ~exact & ~divergent
+        if numerical.any():
+            f = self._numeric()
+            start, width = a[numerical], b[numerical] - a[numerical]
+            # The integrals share one error estimate, so the default tolerances leave them far
+            # less precise than `quad` computes them one at a time.
+            results[numerical], _ = scipy.integrate.quad_vec(
+                lambda t: width * f(start + width * t),
+                0,
+                1,
+                epsabs=1e-13,
+                epsrel=1e-12,
+                norm="max",
+            )
+
+        for index in zip(*numpy.nonzero(~finite & ~divergent & ~empty)):
+            results[index], _ = scipy.integrate.quad(
+                lambda t: float(self._numeric()(t)), a[index], b[index]
+            )
+
+        return results
 
     def graph(
         self,
@@ -106,15 +522,27 @@ class Function:
         ylabel=None,
         xstep=1,
         ystep=1,
+        save=None,
+        return_fig=False,
     ):
-        import plotmath
-        import numpy
+        """Draws the graph of the function.
+
+        Args:
+            domain (tuple, optional): the interval `(xmin, xmax)` to draw the graph on.
+                Defaults to `(-6, 6)`, with the y-axis from -6 to 6.
+            xlabel (str, optional): label of the x-axis.
+            ylabel (str, optional): label of the y-axis.
+            xstep (float): distance between the ticks on the x-axis.
+            ystep (float): distance between the ticks on the y-axis.
+            save (str or pathlib.Path, optional): save the figure to this file instead of
+                showing it.
+            return_fig (bool): return the figure instead of showing it.
+
+        Returns:
+            tuple: `(fig, ax)` if `return_fig` is true, otherwise `None`.
+        """
         import sympy
 
-        # numpy_func = sympy.lambdify("x", self._f_expr, "numpy")
-        def numpy_func(x):
-            return numpy.array([self(i) for i in x])
-
         if domain is not None:
             xmin, xmax = domain
             if xmin != 0:
@@ -123,33 +551,34 @@ class Function:
             else:
                 xmax = xmax + xstep
 
-            x_vals = numpy.linspace(xmin, xmax, 1024)
+            samples = sample(self._numeric(), xmin, xmax)
+            y_low, y_high = value_range(samples)
 
-            ymin = int(numpy.min(numpy_func(x_vals)))
+            ymin = int(y_low)
 
             n = ymin // ystep + 1
             ymin = n * ystep
 
             ymin = ymin if ymin < 0 else 0
 
-            ymax = int(numpy.max(numpy_func(x_vals)))
+            ymax = int(y_high)
             n = ymax // ystep + 2
             ymax = n * ystep
 
         else:
             xmin, xmax = (-6, 6)
             ymin, ymax = (-6, 6)
+            samples = sample(self._numeric(), xmin, xmax)
 
         fn_label = "y = " + sympy.latex(self._f_expr, mul_symbol="dot")
         fn_label = f"${fn_label}$"
-        fig, ax = plotmath.plot(
-            functions=[numpy_func],
-            fn_labels=[fn_label],
+        fig, ax = _plot_samples(
+            samples,
+            fn_label,
             xmin=xmin,
             xmax=xmax,
             ymin=ymin,
             ymax=ymax,
-            ticks=True,
             xstep=xstep,
             ystep=ystep,
         )
@@ -160,7 +589,7 @@ class Function:
         if ylabel is not None:
             ax.set_ylabel(ylabel, fontsize=16, rotation=90, loc="top")
 
-        plotmath.show()
+        return finish(fig, ax, save=save, return_fig=return_fig)
 
     def __str__(self):
         return str(self._f_expr)
@@ -170,28 +599,302 @@ class RationalFunction(Function):
     def __init__(self, f_expr):
         super().__init__(f_expr)
 
-    def vertical_asymptotes(self):
+    def vertical_asymptotes(self, output="pretty"):
+        """Finds the vertical asymptotes of f.
+
+        Args:
+            output (str): `"pretty"` for a list of rendered dicts such as `"{x: 3}"`, or
+                `"raw"` for the dicts themselves.
+
+        Returns:
+            list: one entry per asymptote, from left to right.
+
+        Examples:
+            >>> from casify import *
+            >>> function("(x**2 - 1)/(x**2 - x - 6)").vertical_asymptotes(output="raw")
+            [{x: -2}, {x: 3}]
+        """
         import sympy
 
-        dividend, divisor = sympy.fraction(self._f_expr)
-        zeros_dividend = sympy.solve(dividend, dict=True)
-        zeros_divisor = sympy.solve(divisor, dict=True)
+        x = sympy.Symbol("x")
+        poles = [{x: pole} for pole in _rational_asymptotes(self._f_expr)[0]]
+        if output == "raw":
+            return poles
+        return [pretty(pole) for pole in poles]
+
+    def asymptotes(self, output="pretty"):
+        """Finds the vertical, horizontal and oblique asymptotes of f.
+
+        The horizontal or oblique asymptote is the quotient of the polynomial division of
+        the numerator by the denominator, if its degree is at most one.
+
+        Args:
+            output (str): `"pretty"` for a list of equations such as `"x = 3"` and
+                `"y = x + 3"`, or `"raw"` for a dict with the `"vertical"` asymptotes (a list
+                of x-values) and the `"horizontal"` and `"oblique"` ones (expressions in `x`,
+                or `None`).
+
+        Examples:
+            >>> from casify import *
+            >>> f = function("(x**2 - 1)/(x - 3)")
+            >>> f.asymptotes()
+            ['x = 3', 'y = x + 3']
+            >>> f.asymptotes(output="raw")
+            {'vertical': [3], 'horizontal': None, 'oblique': x + 3}
+        """
+        import sympy
 
-        vertical_asymptotes = []
-        for zero in zeros_divisor:
-            if zero not in zeros_dividend:
-                vertical_asymptotes.append(zero)
+        vertical, horizontal, oblique = _rational_asymptotes(self._f_expr)
+        if output == "raw":
+            return {"vertical": vertical, "horizontal": horizontal, "oblique": oblique}
 
-        vertical_asymptotes = [sympy.pretty(zero) for zero in vertical_asymptotes]
+        x, y = sympy.symbols("x y")
+        equations = [sympy.Eq(x, pole) for pole in vertical]
+        equations += [sympy.Eq(y, line) for line in (horizontal, oblique) if line is not None]
+        return [pretty(equation) for equation in equations]
 
-        return vertical_asymptotes
 
+def _rational_asymptotes(expr):
+    """Returns the asymptotes of a rational function in `x`.
 
-def function(f):
-    """Alternative way to write `function`"""
+    The function is cancelled to lowest terms, so the real roots of the remaining
+    denominator are exactly its poles; with rational coefficients they are isolated on the
+    denominator's polynomial without solving it. The quotient of the division of the numerator by the denominator
+    gives the horizontal (degree 0) or oblique (degree 1) asymptote.
+
+    Returns:
+        tuple: `(poles, horizontal, oblique)`, with the poles in increasing order and each
+        asymptote an expression in `x` or `None`.
+    """
+    import sympy
+
+    x = sympy.Symbol("x")
+    numerator, denominator = sympy.fraction(sympy.cancel(expr))
+    numerator, denominator = sympy.Poly(numerator, x), sympy.Poly(denominator, x)
+    if denominator.degree() <= 0:  # a polynomial, possibly with holes
+        return [], None, None
+    if denominator.domain.is_ZZ or denominator.domain.is_QQ:
+        poles = [root for root, _ in denominator.real_roots(multiple=False)]
+    else:
+        # Roots can only be isolated over the rationals, so others (`x - sqrt(2)`, `x - a`)
+        # are solved for.
+        poles = [
+            root
+            for root in sympy.solve(denominator.as_expr(), x)
+            if root.is_real is not False
+        ]
+        if all(root.is_number for root in poles):
+            poles.sort(key=float)
+
+    quotient, _ = sympy.div(numerator, denominator)
+    line = quotient.as_expr()
+    if quotient.degree() <= 0:
+        return poles, line, None
+    if quotient.degree() == 1:
+        return poles, None, line
+    return poles, None, None
+
+
+def _integrate(expr, a=None, b=None):
+    """Integrates `expr` with respect to `x`, from `a` to `b` if given.
+
+    `"inf"` and `"-inf"` are accepted as bounds. With only one bound, the other is `x`.
+    """
     import sympy
 
-    f = sympy.sympify(f)
+    if a == "inf":
+        a = sympy.oo
+    elif a == "-inf":
+        a = -sympy.oo
+    if b == "inf":
+        b = sympy.oo
+    elif b == "-inf":
+        b = -sympy.oo
+
+    x = sympy.sympify("x")
+    if a is not None and b is None:
+        return sympy.integrate(expr, (x, a, x))
+    elif a is None and b is not None:
+        return sympy.integrate(expr, (x, x, b))
+    elif a is not None and b is not None:
+        return sympy.integrate(expr, (x, a, b))
+    else:
+        return sympy.integrate(expr, x)
+
+
+def _plot_samples(samples, label, **limits):
+    """Draws sampled points as the graph of a function on plotmath's axes.
+
+    plotmath would evaluate the function again on its own grid, so it only sets up the axes
+    here and the samples are drawn the way it draws functions.
+    """
+    import plotmath
+
+    fig, ax = plotmath.plot(functions=[], fn_labels=False, ticks=True, **limits)
+    ax.plot(samples.xs, samples.ys, lw=2.5, label=label)
+    ax.legend(fontsize=20)
+    return fig, ax
+
+
+_SIGNS = {1: "positive", -1: "negative", 0: None, None: None}
+_TRENDS = {1: "increasing", -1: "decreasing", 0: "constant", None: None}
+
+
+def _partition(points, domain=None):
+    """Splits `domain` (or the real line) at `points` into `(start, end)` intervals."""
+    import sympy
+
+    start, end = (-sympy.oo, sympy.oo) if domain is None else map(sympy.sympify, domain)
+    inner = sorted({point for point in points if start < point < end}, key=float)
+    bounds = [start, *inner, end]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _signs(func, intervals, defined):
+    """Returns `(start, end, sign)` for each interval, with the sign of `func` at a point
+    inside it: `1`, `-1`, `0`, or `None` where `func` or the function analyzed (defined on
+    the set `defined`) is undefined."""
+    import numpy
+
+    def inside(start, end):
+        if start.is_infinite and end.is_infinite:
+            return 0.0
+        if start.is_infinite:
+            return float(end) - 1
+        if end.is_infinite:
+            return float(start) + 1
+        return (float(start) + float(end)) / 2
+
+    points = numpy.array([inside(start, end) for start, end in intervals])
+    with numpy.errstate(all="ignore"):
+        values = numpy.broadcast_to(numpy.asarray(func(points), dtype=float), points.shape)
+    return [
+        (
+            start,
+            end,
+            (
+                int(numpy.sign(value))
+                if numpy.isfinite(value) and _may_contain(defined, point)
+                else None
+            ),
+        )
+        for (start, end), point, value in zip(intervals, points, values)
+    ]
+
+
+def _around(point, signs):
+    """Returns the signs on the intervals ending and starting at `point`."""
+    left = next((sign for _, end, sign in signs if end == point), None)
+    right = next((sign for start, _, sign in signs if start == point), None)
+    return left, right
+
+
+def _is_pole(expr, point, defined):
+    """Checks whether `expr` grows without bound as `x` approaches `point` from a side where
+    it is defined."""
+    import sympy
+
+    x = sympy.Symbol("x")
+    step = sympy.Rational(1, 10**6)
+    for direction, nearby in (("-", point - step), ("+", point + step)):
+        if _may_contain(defined, nearby) and sympy.limit(expr, x, point, direction).is_infinite:
+            return True
+    return False
+
+
+def _may_contain(set_, point):
+    """Checks whether `point` is in `set_`, counting it as in if SymPy can't decide."""
+    import sympy
+
+    return set_.contains(point) != sympy.false
+
+
+def _value_at(expr, point):
+    import sympy
+
+    return sympy.simplify(expr.subs(sympy.Symbol("x"), point))
+
+
+_AUTO_BUDGET = 2.0  # seconds for symbolic integration with method="auto" and no time limit
+
+
+def _float_bound(bound):
+    """Converts an integration bound, possibly `"inf"`, `"-inf"` or an expression, to a float."""
+    if bound == "inf":
+        return float("inf")
+    if bound == "-inf":
+        return float("-inf")
+    return float(parse(bound) if isinstance(bound, str) else bound)
+
+
+def _antiderivative_kind(expr):
+    """Classifies `expr` by where `F(b) - F(a)` is valid for its SymPy antiderivative `F`.
+
+    Returns `"entire"` for functions built from polynomials, `sin`, `cos`, `exp`, `sinh` and
+    `cosh`, whose antiderivatives are continuous everywhere, `"rational"` for rational
+    functions, whose antiderivatives are continuous between poles, and `None` otherwise.
+    Other antiderivatives SymPy finds can jump (across branch cuts, for instance).
+    """
+    import sympy
+
+    x = sympy.Symbol("x")
+    if expr.free_symbols - {x}:
+        return None
+    if _is_entire(expr, x):
+        return "entire"
+    if expr.is_rational_function(x):
+        return "rational"
+    return None
+
+
+def _is_entire(expr, x):
+    import sympy
+
+    if expr.is_polynomial(x):
+        return True
+    if isinstance(expr, (sympy.Add, sympy.Mul)):
+        return all(_is_entire(arg, x) for arg in expr.args)
+    if isinstance(expr, sympy.Pow):
+        base, exponent = expr.args
+        if exponent.is_Integer and exponent >= 0:
+            return _is_entire(base, x)
+        return base.is_positive and not base.has(x) and _is_entire(exponent, x)
+    if isinstance(expr, (sympy.sin, sympy.cos, sympy.exp, sympy.sinh, sympy.cosh)):
+        return _is_entire(expr.args[0], x)
+    return False
+
+
+def _real_poles(expr):
+    """Returns the real poles of a rational function in `x` as floats."""
+    return [float(pole) for pole in _rational_asymptotes(expr)[0]]
+
+
+def _has_continuous_antiderivative(expr, a, b):
+    """Checks whether `F(b) - F(a)` gives the integral of `expr` from `a` to `b`."""
+    import sympy
+
+    if a is None or b is None or isinstance(a, str) or isinstance(b, str):
+        return False
+
+    a, b = sympy.sympify(a), sympy.sympify(b)
+    if not (a.is_real and b.is_real and a.is_finite and b.is_finite):
+        return False
+
+    kind = _antiderivative_kind(expr)
+    if kind == "rational":
+        _, denominator = sympy.fraction(sympy.cancel(expr))
+        denominator = sympy.Poly(denominator, sympy.Symbol("x"))
+        # Roots can only be counted over the rationals; `sympy.integrate` handles the rest.
+        if not (denominator.domain.is_ZZ or denominator.domain.is_QQ):
+            return False
+        lower, upper = sorted([a, b])
+        return denominator.count_roots(lower, upper) == 0
+    return kind == "entire"
+
+
+def function(f):
+    """Alternative way to write `function`"""
+    f = parse(f)
     if f.is_rational_function() and not f.is_polynomial():
         return RationalFunction(f)
     else:
@@ -210,5 +913,5 @@ def derivative(expr, var="x"):
     """
     import sympy
 
-    expr = sympy.sympify(expr)
+    expr = parse(expr)
     return sympy.diff(expr, sympy.symbols(var))
@@ -43,22 +43,36 @@ class Funksjon(Function):
     def utvid(self):
         return self.expand()
 
-    def nullpunkter(self):
-        return self.zeros()
-
-    def ekstremalpunkter(self):
-        return self.extrema()
-
-    def integral(self, a=None, b=None):
-        return super().integral(a, b)
-
-    def graf(self, definisjonsmengde=None, xnavn=None, ynavn=None, xstep=1, ystep=1):
+    def nullpunkter(self, utdata="pretty", definisjonsmengde=None, numerisk=False):
+        return self.zeros(output=utdata, domain=definisjonsmengde, numerical=numerisk)
+
+    def ekstremalpunkter(self, utdata="pretty", definisjonsmengde=None, numerisk=False):
+        return self.extrema(output=utdata, domain=definisjonsmengde, numerical=numerisk)
+
+    def analyser(self, definisjonsmengde=None):
+        return self.analyze(domain=definisjonsmengde)
+
+    def integral(self, a=None, b=None, timeout=None, metode="symbolic"):
+        return super().integral(a, b, timeout=timeout, method=metode)
+
+    def graf(
+        self,
+        definisjonsmengde=None,
+        xnavn=None,
+        ynavn=None,
+        xstep=1,
+        ystep=1,
+        lagre=None,
+        returner_figur=False,
+    ):
         return self.graph(
             domain=definisjonsmengde,
             xstep=xstep,
             ystep=ystep,
             xlabel=xnavn,
             ylabel=ynavn,
+            save=lagre,
+            return_fig=returner_figur,
         )
 
 
@@ -0,0 +1,130 @@
+class SolutionSet:
+    """The solution of a univariate equation or inequality as a set of real numbers.
+
+    Wraps a SymPy `Interval`, `Union` or `FiniteSet`. Comparing two solution sets compares the
+    sets, and the string form is only rendered when it is asked for.
+
+    Args:
+        solution_set (sympy.Set): the set of solutions.
+        var (sympy.Symbol): the variable solved for.
+
+    Examples:
+        >>> from casify import *
+        >>> s = solve("x**2 - x - 2 > 0", output="interval")
+        >>> s
+        SolutionSet(Union(Interval.open(-oo, -1), Interval.open(2, oo)))
+        >>> str(s)
+        'x < -1 ∨ 2 < x'
+        >>> s == solve("(x + 1)*(x - 2) > 0", output="interval")
+        True
+        >>> 3 in s
+        True
+        >>> s.to_json()
+        {'variable': 'x', 'intervals': [{'start': '-oo', 'end': '-1', 'left_open': True, 'right_open': True}, {'start': '2', 'end': 'oo', 'left_open': True, 'right_open': True}]}
+    """
+
+    def __init__(self, solution_set, var):
+        self._set = solution_set
+        self._var = var
+        self._text = None
+
+    @classmethod
+    def from_relational(cls, expr, var):
+        """Builds the solution set from a (simplified) inequality solution such as `(x < -1) | (2 < x)`."""
+        import sympy
+
+        if expr == sympy.true:
+            return cls(sympy.S.Reals, var)
+        if expr == sympy.false:
+            return cls(sympy.S.EmptySet, var)
+        return cls(expr.as_set(), var)
+
+    @classmethod
+    def from_json(cls, data):
+        """Rebuilds a solution set from the output of `to_json`."""
+        import sympy
+
+        from .cache import parse
+
+        intervals = [
+            sympy.Interval(
+                parse(interval["start"]),
+                parse(interval["end"]),
+                interval["left_open"],
+                interval["right_open"],
+            )
+            for interval in data["intervals"]
+        ]
+        return cls(sympy.Union(*intervals), sympy.Symbol(data["variable"]))
+
+    @property
+    def set(self):
+        """sympy.Set: the underlying SymPy set."""
+        return self._set
+
+    @property
+    def var(self):
+        """sympy.Symbol: the variable solved for."""
+        return self._var
+
+    @property
+    def intervals(self):
+        """list: the set as `(start, end, left_open, right_open)` tuples in increasing order.
+        Points are closed intervals of length zero."""
+        import sympy
+
+        if isinstance(self._set, sympy.Union):
+            parts = self._set.args
+        elif self._set == sympy.S.EmptySet:
+            parts = []
+        else:
+            parts = [self._set]
+
+        intervals = []
+        for part in parts:
+            if isinstance(part, sympy.Interval):
+                intervals.append((part.start, part.end, part.left_open, part.right_open))
+            elif isinstance(part, sympy.FiniteSet):
+                intervals.extend((point, point, False, False) for point in part)
+            else:
+                raise TypeError(f"Can't write {part} as intervals")
+
+        return sorted(intervals, key=lambda interval: float(interval[0]))
+
+    def to_json(self):
+        """Returns the set as a dict of strings and booleans, ready for `json.dumps`."""
+        return {
+            "variable": str(self._var),
+            "intervals": [
+                {
+                    "start": str(start),
+                    "end": str(end),
+                    "left_open": bool(left_open),
+                    "right_open": bool(right_open),
+                }
+                for start, end, left_open, right_open in self.intervals
+            ],
+        }
+
+    def __contains__(self, value):
+        import sympy
+
+        return self._set.contains(value) == sympy.true
+
+    def __eq__(self, other):
+        if isinstance(other, SolutionSet):
+            return self._set == other._set
+        return self._set == other
+
+    def __hash__(self):
+        return hash(self._set)
+
+    def __repr__(self):
+        return f"SolutionSet({self._set})"
+
+    def __str__(self):
+        if self._text is None:
+            from .printing import simplify_solution
+
+            self._text = simplify_solution(self._set.as_relational(self._var), self._var)
+        return self._text
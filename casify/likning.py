@@ -1,16 +1,40 @@
-from .equation import solve, nsolve, _make_equation
+from .equation import asolve, solve, solve_many, nsolve, _make_equation, _nsolve_interval
+from .printing import pretty
+from .timeout import resolve_timeout, run_with_timeout
 
 
-def nløs(eq, startverdi=1):
+def nløs(eq, startverdi=1, intervall=None, timeout=None):
+    """Løser en likning numerisk.
+
+    Args:
+        eq (str): likningen.
+        startverdi (float): der Newtons metode begynner å lete etter en løsning. Standardverdi: `1`.
+        intervall (tuple, optional): `(a, b)` for å finne alle reelle løsninger i `[a, b]` i stedet for den som ligger nærmest `startverdi`.
+        timeout (float, optional): antall sekunder før beregningen avbrytes.
+
+    Returns:
+        str: løsningen(e), avrundet til tre desimaler.
+
+    Eksempler:
+        >>> from casify import *
+        >>> nløs("sin(x) = 0.5", intervall=(0, 10))
+        'x = 0.524 ∨ x = 2.618 ∨ x = 6.807 ∨ x = 8.901'
+    """
     import sympy
 
     eq = _make_equation(eq)
+    if intervall is not None:
+        løsning = _nsolve_interval(eq, intervall, timeout=timeout)
+        return "Ingen løsning" if løsning == "No solution" else løsning
+
     try:
-        solution = sympy.nsolve(eq, startverdi)
+        solution = run_with_timeout(
+            sympy.nsolve, eq, startverdi, timeout=resolve_timeout(timeout)
+        )
         solution = round(solution, 3)
         var = eq.free_symbols.pop()
         s = sympy.Eq(var, solution)
-        s = sympy.pretty(s, use_unicode=True)
+        s = pretty(s, use_unicode=True)
 
         return s
 
@@ -20,15 +44,18 @@ def nløs(eq, startverdi=1):
         )
 
 
-def løs(*likninger, numerisk=False):
+def løs(*likninger, numerisk=False, utdata="pretty", timeout=None, navnerom=None):
     """Løser én eller flere likninger (et likningssystem), eller én ulikhet.
 
     Args:
         *likninger (str): Et variabelt antall likninger eller ulikheter separert med komma som representerer likningene eller ulikheten.
-        pprint (bool): Hvis `True` gir en matematisk tekststreng-representasjon av løsningen. Standardverdi: `True`.
+        numerisk (bool): Runder av løsningene til tre desimaler. Standardverdi: `False`.
+        utdata (str): `"pretty"` gir en matematisk tekststreng, `"latex"` en LaTeX-streng og `"raw"` de uformaterte SymPy-løsningene. Standardverdi: `"pretty"`.
+        timeout (float, optional): antall sekunder før beregningen avbrytes med `CasifyTimeout`. Standardverdi: grensen satt med `casify.set_default_timeout`.
+        navnerom (Namespace eller dict, optional): funksjonene som kall som `f(1)` i likningene viser til. Standardverdi: `Funksjon`-objektene definert i `__main__`.
 
     Returns:
-        str eller list: En tekststreng-representasjon (str) av løsningen(e) hvis `pprint` er `True`. Hvis ikke en liste med dictionaries som inneholder løsningene. Returnerer "Ingen løsning" hvis ingen reelle løsninger finnes.
+        str eller list: En tekststreng-representasjon (str) av løsningen(e), eller med `utdata="raw"` en liste med dictionaries som inneholder løsningene. Returnerer "Ingen løsning" hvis ingen reelle løsninger finnes.
 
     Eksempler:
         >>> from casify import *
@@ -50,13 +77,107 @@ def løs(*likninger, numerisk=False):
          '-1 ≤ x ∧ x ≤ 2'
 
     """
-    løsning = solve(*likninger, numerical=numerisk)
+    løsning = solve(
+        *likninger,
+        numerical=numerisk,
+        output=utdata,
+        timeout=timeout,
+        namespace=navnerom,
+    )
     if løsning == "No solution":
         return "Ingen løsning"
     else:
         return løsning
 
 
-def Løs(*likninger, numerisk=False):
+def Løs(*likninger, numerisk=False, utdata="pretty", timeout=None, navnerom=None):
     """Alternativ skrivemåte for `løs`."""
-    return løs(*likninger, numerisk=numerisk)
+    return løs(
+        *likninger, numerisk=numerisk, utdata=utdata, timeout=timeout, navnerom=navnerom
+    )
+
+
+async def aløs(
+    *likninger,
+    numerisk=False,
+    utdata="pretty",
+    timeout=None,
+    navnerom=None,
+    executor=None,
+):
+    """Løser som `løs`, uten å blokkere event-loopen.
+
+    Args:
+        *likninger (str): likningene eller ulikheten, som for `løs`.
+        numerisk (bool): sendes videre til `løs`.
+        utdata (str): sendes videre til `løs`.
+        timeout (float, optional): sendes videre til `løs`.
+        navnerom (Namespace eller dict, optional): sendes videre til `løs`.
+        executor (concurrent.futures.Executor, optional): der beregningen kjøres. Standardverdi: event-loopens tråd-pool.
+
+    Returns:
+        str eller list: løsningen, slik `løs` returnerer den.
+
+    Eksempler:
+        >>> import asyncio
+        >>> from casify import *
+        >>> asyncio.run(aløs("x**2 = -1"))
+        'Ingen løsning'
+    """
+    løsning = await asolve(
+        *likninger,
+        numerical=numerisk,
+        output=utdata,
+        timeout=timeout,
+        namespace=navnerom,
+        executor=executor,
+    )
+    if løsning == "No solution":
+        return "Ingen løsning"
+    return løsning
+
+
+def løs_mange(
+    likninger,
+    arbeidere=None,
+    chunksize=1,
+    timeout=None,
+    numerisk=False,
+    utdata="pretty",
+    navnerom=None,
+):
+    """Løser mange uavhengige likninger, likningssystemer eller ulikheter parallelt.
+
+    Løsningene gis i samme rekkefølge som likningene, fortløpende etter hvert som de blir ferdige.
+    Et element som feiler eller bruker lengre tid enn `timeout`, gir unntaket i stedet for løsningen.
+
+    Args:
+        likninger (iterable): likninger som tekststrenger, eller likningssystemer som tupler eller lister av tekststrenger.
+        arbeidere (int, optional): antall prosesser. Standardverdi: antall CPU-er.
+        chunksize (int): antall elementer som sendes til en prosess om gangen. Standardverdi: `1`.
+        timeout (float, optional): antall sekunder hvert element får bruke. Standardverdi: `None` (ingen grense).
+        numerisk (bool): sendes videre til `løs`.
+        utdata (str): sendes videre til `løs`.
+        navnerom (Namespace eller dict, optional): sendes videre til `løs`.
+
+    Yields:
+        str, list eller Exception: løsningen av hvert element, slik `løs` ville returnert den.
+
+    Eksempler:
+        >>> from casify import *
+        >>> list(løs_mange(["x**2 = 4", ("x + y = 2", "x - y = 0")], arbeidere=2))
+        ['x = -2 ∨ x = 2', 'x = 1 ∧ y = 1']
+    """
+    for løsning in solve_many(
+        likninger,
+        workers=arbeidere,
+        chunksize=chunksize,
+        timeout=timeout,
+        numerical=numerisk,
+        output=utdata,
+        namespace=navnerom,
+    ):
+        if isinstance(løsning, str) and løsning == "No solution":
+            yield "Ingen løsning"
+        else:
+            yield løsning
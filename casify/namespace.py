@@ -0,0 +1,177 @@
+import threading
+
+
+class Namespace:
+    """The functions that equations passed to `solve` can refer to by name.
+
+    Each function is compiled to a SymPy `Lambda` when it is registered, so resolving calls
+    such as `f(1)`, `f(a + 1)` or `g(f(2))` is a single substitution over the equation.
+    Registering and resolving are thread-safe, and a namespace is only seen by the calls it
+    is passed to, so concurrent requests can use different functions with the same names.
+
+    Args:
+        functions (dict, optional): functions by name.
+        **named: more functions, given as keyword arguments.
+
+    Functions can be `Function` objects, expressions in `x` (as strings or SymPy
+    expressions) or SymPy `Lambda`s.
+
+    Examples:
+        >>> from casify import *
+        >>> ns = Namespace(f=Function("a*x**2 + b*x + c"))
+        >>> solve("f(1) = 2", "f(-1) = 3", "f(3) = 4", namespace=ns)
+        'a = 3/8 ∧ b = -1/2 ∧ c = 17/8'
+        >>> solve("f(t + 1) = 0", "a = 1", "b = 0", "c = -4", namespace=ns)
+        '(a = 1 ∧ b = 0 ∧ c = -4 ∧ t = -3) ∨ (a = 1 ∧ b = 0 ∧ c = -4 ∧ t = 1)'
+    """
+
+    def __init__(self, functions=None, **named):
+        self._lock = threading.Lock()
+        self._functions = {}
+        self._compiled = {}
+        self.update(functions or {}, **named)
+
+    @classmethod
+    def of(cls, namespace):
+        """Returns `namespace` as a `Namespace`, wrapping dicts. `None` is passed through."""
+        if namespace is None or isinstance(namespace, Namespace):
+            return namespace
+        return cls(namespace)
+
+    def register(self, name, function):
+        """Adds `function` under `name`, replacing any function already registered by that name."""
+        self.update({name: function})
+
+    def update(self, functions=None, **named):
+        """Adds every function in `functions` and `named`."""
+        functions = {**(functions or {}), **named}
+        compiled = {name: _compile(function) for name, function in functions.items()}
+
+        # The dicts are replaced rather than changed, so `substitute` can read them unlocked.
+        with self._lock:
+            self._functions = {**self._functions, **functions}
+            self._compiled = {**self._compiled, **compiled}
+
+    def unregister(self, name):
+        """Removes the function registered under `name`."""
+        with self._lock:
+            if name not in self._functions:
+                raise KeyError(name)
+            self._functions = {k: v for k, v in self._functions.items() if k != name}
+            self._compiled = {k: v for k, v in self._compiled.items() if k != name}
+
+    def substitute(self, expr):
+        """Replaces every call of a registered function in `expr` by its value.
+
+        Raises:
+            NameError: if `expr` calls a function that isn't registered.
+        """
+        return _substitute(expr, self._compiled)
+
+    def __getitem__(self, name):
+        return self._functions[name]
+
+    def __contains__(self, name):
+        return name in self._functions
+
+    def __iter__(self):
+        return iter(self._functions)
+
+    def __len__(self):
+        return len(self._functions)
+
+    def __repr__(self):
+        return f"Namespace({', '.join(self._functions)})"
+
+    def __getstate__(self):
+        # Locks can't be pickled, and the compiled lambdas are cheap to rebuild.
+        return {"functions": self._functions}
+
+    def __setstate__(self, state):
+        self.__init__(state["functions"])
+
+
+def _compile(function):
+    import sympy
+
+    from .cache import parse
+
+    if isinstance(function, sympy.Lambda):
+        return function
+    expr = function._f_expr if hasattr(function, "_f_expr") else parse(function)
+    return sympy.Lambda(sympy.Symbol("x"), expr)
+
+
+def _builtins():
+    import sympy
+
+    x = sympy.Symbol("x")
+    return {
+        "log2": sympy.Lambda(x, sympy.log(x, 2)),
+        "log10": sympy.Lambda(x, sympy.log(x, 10)),
+    }
+
+
+def _substitute(expr, compiled):
+    from sympy.core.function import AppliedUndef
+
+    def resolve(call):
+        name = type(call).__name__
+        function = compiled.get(name)
+        if function is None:
+            raise NameError(f"Unknown function {name!r} in {expr}")
+        return function(*call.args)
+
+    return expr.replace(lambda e: isinstance(e, AppliedUndef), resolve)
+
+
+def _main_functions():
+    import sys
+
+    main_globals = getattr(sys.modules.get("__main__"), "__dict__", {})
+    return {
+        name: value
+        for name, value in list(main_globals.items())
+        if hasattr(value, "_f_expr") and not isinstance(value, type)
+    }
+
+
+def main_namespace():
+    """Returns a namespace with the `Function` objects defined in `__main__`."""
+    return Namespace(_main_functions())
+
+
+def function_names(namespace=None):
+    """Returns the names that `resolve_functions` resolves as functions, without compiling them.
+
+    Equations are parsed with these names as undefined functions, so a function named like a
+    SymPy object, such as `N`, `S` or `gamma`, is called rather than the SymPy object.
+    """
+    if namespace is None:
+        return frozenset(_main_functions())
+    return frozenset(namespace)
+
+
+def resolve_functions(expr, namespace=None):
+    """Replaces calls of user-defined functions such as `f(1)` in `expr` by their values.
+
+    The functions are looked up in `namespace`, or, if no namespace is given, among the
+    `Function` objects defined in `__main__`. `log2` and `log10` are always available.
+
+    Args:
+        expr (sympy.Expr): the parsed expression.
+        namespace (Namespace or dict, optional): the functions to use.
+
+    Returns:
+        sympy.Expr: `expr` without calls of undefined functions.
+
+    Raises:
+        NameError: if `expr` calls a function that can't be found.
+    """
+    from sympy.core.function import AppliedUndef
+
+    if not expr.has(AppliedUndef):
+        return expr
+
+    namespace = main_namespace() if namespace is None else Namespace.of(namespace)
+    return _substitute(expr, {**_builtins(), **namespace._compiled})
@@ -0,0 +1,180 @@
+def lambdify(expr, var="x"):
+    """Compiles an expression in `var` into a callable that maps arrays of values to an ndarray.
+
+    Complex values (e.g. `sqrt(x)` for negative `x`) are returned as `nan`. Expressions with
+    free symbols other than `var` can't be compiled and fall back to substitution point by point.
+
+    Args:
+        expr (sympy.Expr): the expression to compile.
+        var (str or sympy.Symbol): the variable. Defaults to `"x"`.
+
+    Returns:
+        callable: a function taking a scalar or an array and returning an ndarray.
+    """
+    import numpy
+    import sympy
+
+    var = sympy.Symbol(var) if isinstance(var, str) else var
+
+    if expr.free_symbols - {var}:
+
+        def numpy_func(values):
+            return numpy.array([expr.subs(var, value) for value in numpy.ravel(values)])
+
+        return numpy_func
+
+    compiled = sympy.lambdify(var, expr, "numpy")
+
+    def numpy_func(values):
+        values = numpy.asarray(values, dtype=float)
+        with numpy.errstate(all="ignore"):
+            results = numpy.asarray(compiled(values))
+        if numpy.iscomplexobj(results):
+            results = numpy.where(
+                numpy.abs(results.imag) < 1e-12, results.real, numpy.nan
+            )
+        # Constant expressions compile to a scalar, so broadcast to the input's shape.
+        return numpy.broadcast_to(results.astype(float), values.shape).copy()
+
+    return numpy_func
+
+
+def real_diff(expr, var="x", order=1):
+    """Differentiates `expr` as a function of a real variable.
+
+    Differentiating with respect to a plain symbol turns `Abs(x)` into derivatives of `re(x)`
+    and `im(x)`, which can't be compiled; for a real variable it gives `sign(x)`. The
+    `DiracDelta` terms from differentiating `sign` or `Heaviside` are dropped, leaving the
+    derivative where it exists.
+
+    Args:
+        expr (sympy.Expr): the expression.
+        var (str or sympy.Symbol): the variable. Defaults to `"x"`.
+        order (int): the order of the derivative. Defaults to `1`.
+
+    Returns:
+        sympy.Expr: the derivative, in `var`.
+    """
+    import sympy
+
+    var = sympy.Symbol(var) if isinstance(var, str) else var
+    real_var = sympy.Dummy(var.name, real=True)
+    derivative = sympy.diff(expr.subs(var, real_var), real_var, order)
+    derivative = derivative.replace(sympy.DiracDelta, lambda *args: sympy.S.Zero)
+    return derivative.subs(real_var, var)
+
+
+def find_roots(expr, var, a, b, samples=2000, tol=1e-12):
+    """Finds all real roots of `expr` in the interval `[a, b]`.
+
+    The expression and its derivative are compiled once and evaluated on a grid. Every sign
+    change brackets a root, which is refined with Brent's method; local minima of `|f|` that
+    don't change sign (roots of even multiplicity) are refined with Newton's method. Sign
+    changes across poles are discarded because `f` doesn't vanish there.
+
+    Roots closer together than the grid spacing may be reported as one.
+
+    Args:
+        expr (sympy.Expr): the expression, as the left-hand side of `expr = 0`.
+        var (sympy.Symbol): the variable.
+        a (float): left end of the interval.
+        b (float): right end of the interval.
+        samples (int): number of grid intervals. Defaults to `2000`.
+        tol (float): absolute tolerance for the roots. Defaults to `1e-12`.
+
+    Returns:
+        list: the roots as floats, in increasing order.
+    """
+    import numpy
+    from scipy.optimize import brentq, newton
+
+    f = lambdify(expr, var)
+    df = lambdify(real_diff(expr, var), var)
+
+    def f_scalar(t):
+        return float(f(t))
+
+    xs = numpy.linspace(float(a), float(b), samples + 1)
+    ys = f(xs)
+    finite = numpy.isfinite(ys)
+    scale = numpy.max(numpy.abs(ys[finite]), initial=1.0)
+
+    def is_root(t):
+        value = f_scalar(t)
+        return numpy.isfinite(value) and abs(value) <= 1e-8 * max(1.0, scale)
+
+    candidates = list(xs[finite & (ys == 0)])
+
+    # Sign changes between neighbouring grid points
+    brackets = numpy.nonzero(
+        finite[:-1] & finite[1:] & (numpy.sign(ys[:-1]) * numpy.sign(ys[1:]) < 0)
+    )[0]
+    for i in brackets:
+        candidates.append(brentq(f_scalar, xs[i], xs[i + 1], xtol=tol))
+
+    # Touching roots: local minima of |f| without a sign change
+    abs_ys = numpy.where(finite, numpy.abs(ys), numpy.inf)
+    minima = numpy.nonzero(
+        (abs_ys[1:-1] < abs_ys[:-2])
+        & (abs_ys[1:-1] <= abs_ys[2:])
+        & (numpy.sign(ys[:-2]) == numpy.sign(ys[2:]))
+    )[0]
+    for i in minima + 1:
+        try:
+            root = newton(
+                f_scalar, xs[i], fprime=lambda t: float(df(t)), tol=tol, maxiter=100
+            )
+        except (RuntimeError, ZeroDivisionError):
+            continue
+        if xs[i - 1] <= root <= xs[i + 1]:
+            candidates.append(root)
+
+    roots = []
+    for root in sorted(candidates):
+        if not is_root(root):
+            continue
+        if roots and abs(root - roots[-1]) <= max(1e-9, 1e3 * tol) * max(1.0, abs(root)):
+            continue
+        roots.append(float(root))
+
+    return roots
+
+
+class Estimate(float):
+    """A number computed numerically, with an estimate of its absolute error.
+
+    Behaves as a `float`; the error estimate is available as `error`.
+
+    Examples:
+        >>> from casify import *
+        >>> area = Function("exp(-x**2)*log(x + 2)").integral(0, 1, method="numeric")
+        >>> round(area, 6)
+        0.656318
+        >>> area.error < 1e-10
+        True
+    """
+
+    def __new__(cls, value, error):
+        estimate = super().__new__(cls, value)
+        estimate.error = float(error)
+        return estimate
+
+    def __reduce__(self):
+        return Estimate, (float(self), self.error)
+
+
+def quad(f, a, b):
+    """Integrates the vectorized callable `f` from `a` to `b` with adaptive quadrature.
+
+    Args:
+        f (callable): the integrand, as returned by `lambdify`.
+        a (float): lower bound; may be `-inf`.
+        b (float): upper bound; may be `inf`.
+
+    Returns:
+        Estimate: the integral, with the estimated absolute error.
+    """
+    from scipy.integrate import quad as scipy_quad
+
+    value, error = scipy_quad(lambda t: float(f(t)), a, b, limit=200)
+    return Estimate(value, error)
@@ -1,39 +1,57 @@
-def reorder_solution(solution):
-    """Reorder terms so negative bounds appear before positive ones"""
-    if "∨" not in solution:
-        return solution
+import threading
 
-    # Split into OR terms and strip whitespace
-    terms = [t.strip() for t in solution.split("∨")]
+from .cache import parse
 
-    # Helper to check if term contains negative number
-    def has_negative(term):
-        return "-" in term and any(c.isdigit() for c in term)
+# SymPy's pretty printer switches a global unicode flag while it renders, so renders from
+# different threads are serialized.
+_render_lock = threading.RLock()
 
-    # Sort terms - negative bounds first
-    sorted_terms = sorted(terms, key=lambda x: (0 if has_negative(x) else 1))
 
-    return " ∨ ".join(sorted_terms)
+def pretty(expr, **settings):
+    """Thread-safe `sympy.pretty`."""
+    import sympy
 
+    with _render_lock:
+        return sympy.pretty(expr, **settings)
 
-def is_redundant_bound(expr):
-    import sympy
-    from sympy import Symbol, oo
 
-    """Check if expression is a redundant bound like (-oo < x) or (x < oo)"""
-    x = Symbol("x")
-    return isinstance(expr, sympy.core.relational.Relational) and (
-        (expr.lhs == x and expr.rhs == oo)
-        or (expr.lhs == -oo and expr.rhs == x)
-        or (expr.lhs == x and expr.rhs == -oo)
-        or (expr.rhs == x and expr.lhs == oo)
+def reorder_solution(expr):
+    """Returns the terms of a disjunction ordered so negative bounds appear before positive ones.
+
+    SymPy keeps the arguments of `Or` in a canonical order, so the ordering can't be stored in
+    the expression itself and is applied when rendering instead.
+    """
+    from sympy import Or, default_sort_key
+
+    if not isinstance(expr, Or):
+        return [expr]
+
+    def has_negative(term):
+        return any(
+            number.is_negative and number.is_finite
+            for number in term.atoms()
+            if number.is_Number
+        )
+
+    return sorted(
+        expr.args,
+        key=lambda term: (0 if has_negative(term) else 1, default_sort_key(term)),
     )
 
 
-def ast_simplify_inequalities(expr):
-    from sympy import And, Or, Symbol
+def is_redundant_bound(expr):
+    """Check if expression is a redundant bound like (-oo < x) or (x < oo)"""
+    from sympy import oo
+    from sympy.core.relational import Relational
 
-    x = Symbol("x")
+    if not isinstance(expr, Relational):
+        return False
+    sides = [expr.lhs, expr.rhs]
+    return any(side.is_Symbol for side in sides) and any(side in [oo, -oo] for side in sides)
+
+
+def ast_simplify_inequalities(expr):
+    from sympy import And, Or
 
     # Base case: if expression is atomic or doesn't need simplification
     if not isinstance(expr, (And, Or)):
@@ -58,52 +76,85 @@ def ast_simplify_inequalities(expr):
         # Rebuild And expression with simplified terms
         return And(*terms)
 
-    if isinstance(expr, Or):
-        # Simplify each term in the Or expression
-        terms = [ast_simplify_inequalities(term) for term in expr.args]
+    # Simplify each term in the Or expression. The order is applied by `reorder_solution`.
+    return Or(*[ast_simplify_inequalities(term) for term in expr.args])
 
-        # Sort terms to put negative bounds first
-        def sort_key(term):
-            import sympy
 
-            # Helper to determine if term represents x < negative_number
-            if isinstance(term, sympy.core.relational.StrictLessThan):
-                if term.lhs == x and term.rhs.is_number:
-                    return (0, float(term.rhs))
-            return (1, 0)  # Default sort position for other terms
+def replace_special_cases(expr, var=None):
+    """Returns the text for solutions that are the whole real line or empty, otherwise `None`.
 
-        sorted_terms = sorted(terms, key=sort_key)
-        return Or(*sorted_terms)
+    `var` names the variable; it defaults to the only variable in `expr`, or `x`.
+    """
+    from sympy import And, false, true
 
-    return expr
+    if var is None:
+        var = next(iter(expr.free_symbols)) if len(expr.free_symbols) == 1 else "x"
 
+    if expr == true or (
+        isinstance(expr, And) and all(is_redundant_bound(term) for term in expr.args)
+    ):
+        return f"{var} ∈ ℝ"
+    if expr == false:
+        return f"{var} ∈ ∅"
+    return None
 
-def replace_special_cases(solution):
-    solution = solution.replace("-∞ < x ∧ x < ∞", "x ∈ ℝ")
-    solution = solution.replace("False", "x ∈ ∅")
 
-    return solution
+def _pretty_terms(terms, use_unicode=True):
+    """Pretty-prints `terms` joined by "∨" in the given order, like `sympy.pretty` does for `Or`."""
+    from sympy.printing.pretty.pretty import PrettyPrinter
+    from sympy.printing.pretty.pretty_symbology import pretty_use_unicode
+    from sympy.printing.pretty.stringpict import prettyForm
 
+    printer = PrettyPrinter({"use_unicode": use_unicode})
 
-def simplify_solution(solution_str):
-    import sympy
-
-    try:
-        # Convert string to Sympy expression
-        expr = sympy.sympify(solution_str)
-        # Transform AST to remove redundant constraints
-        expr_simpl = ast_simplify_inequalities(expr)
-        # Convert to pretty string with unicode
+    with _render_lock:
+        previous = pretty_use_unicode(use_unicode)
         try:
-            expr_simpl = sympy.pretty(expr_simpl, use_unicode=True)
-        except UnicodeEncodeError:
-            expr_simpl = sympy.pretty(expr_simpl)
+            pform = None
+            for term in terms:
+                pform_term = printer._print(term)
+                if term.is_Boolean and not term.is_Not:
+                    pform_term = prettyForm(*pform_term.parens())
+
+                if pform is None:
+                    pform = pform_term
+                else:
+                    pform = prettyForm(*pform.right(" ∨ " if use_unicode else " | "))
+                    pform = prettyForm(*pform.right(pform_term))
+
+            return pform.render(**printer._settings)
+        finally:
+            pretty_use_unicode(previous)
+
 
-        expr_simpl = replace_special_cases(expr_simpl)
+def simplify_solution(solution, var=None):
+    """Renders the solution of an inequality as a string.
 
-        expr_simpl = reorder_solution(expr_simpl)
+    Redundant bounds such as `-∞ < x` are dropped, the whole real line and the empty set are
+    written as `x ∈ ℝ` and `x ∈ ∅`, and intervals with negative bounds come first.
 
-        return expr_simpl
-    except Exception as e:
-        print(f"Error processing solution: {e}")
-        return solution_str
+    Args:
+        solution (sympy.Basic or str): the solution as returned by SymPy's inequality solvers.
+        var (sympy.Symbol, optional): the variable, for naming it in `x ∈ ℝ` and `x ∈ ∅`.
+            Defaults to the only variable in `solution`, or `x`.
+
+    Returns:
+        str: the rendered solution.
+    """
+    expr = ast_simplify_inequalities(parse(solution))
+
+    special_case = replace_special_cases(expr, var)
+    if special_case is not None:
+        return special_case
+
+    terms = reorder_solution(expr)
+    if len(terms) == 1:
+        try:
+            return pretty(expr, use_unicode=True)
+        except UnicodeEncodeError:
+            return pretty(expr)
+
+    try:
+        return _pretty_terms(terms, use_unicode=True)
+    except UnicodeEncodeError:
+        return _pretty_terms(terms, use_unicode=False)
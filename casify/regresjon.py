@@ -1,11 +1,17 @@
+from .function import _plot_samples
 from .funksjon import Funksjon
+from .printing import pretty
+from .regression import FitStatistics, _compile_model, _fit, _fit_many
+from .rendering import finish
+from .sampling import sample, value_range
 
 
-class RegresjonModell(Funksjon):
-    def __init__(self, f_expr, xdata, ydata):
+class RegresjonModell(Funksjon, FitStatistics):
+    def __init__(self, f_expr, xdata, ydata, fit=None):
         super().__init__(f_expr)
         self._xdata = xdata
         self._ydata = ydata
+        self._fit = fit
 
     def __repr__(self):
         return str(self._f_expr)
@@ -13,7 +19,7 @@ class RegresjonModell(Funksjon):
     def __str__(self):
         import sympy
 
-        return sympy.pretty(self._f_expr)
+        return pretty(self._f_expr)
 
     def graf(
         self,
@@ -23,15 +29,11 @@ class RegresjonModell(Funksjon):
         xstep=1,
         ystep=1,
         plot_data=True,
+        lagre=None,
+        returner_figur=False,
     ):
-        import plotmath
-        import numpy
         import sympy
 
-        # numpy_func = sympy.lambdify("x", self._f_expr, "numpy")
-        def numpy_func(x):
-            return numpy.array([self(i) for i in x])
-
         if definisjonsmengde is not None:
             xmin, xmax = definisjonsmengde
             # if xmin != 0:
@@ -40,16 +42,17 @@ class RegresjonModell(Funksjon):
             # else:
             #     xmax = xmax + xstep
 
-            x_vals = numpy.linspace(xmin, xmax, 1024)
+            samples = sample(self._numeric(), xmin, xmax)
+            y_low, y_high = value_range(samples)
 
-            ymin = int(numpy.min(numpy_func(x_vals)))
+            ymin = int(y_low)
 
             n = ymin // ystep + 1
             ymin = n * ystep
 
             ymin = ymin if ymin < 0 else 0
 
-            ymax = int(numpy.max(numpy_func(x_vals)))
+            ymax = int(y_high)
             n = ymax // ystep + 2
             ymax = n * ystep
 
@@ -63,17 +66,17 @@ class RegresjonModell(Funksjon):
             xmin, xmax = (-6, 6)
             definisjonsmengde = (xmin, xmax)
             ymin, ymax = (-6, 6)
+            samples = sample(self._numeric(), xmin, xmax)
 
         fn_label = "y = " + sympy.latex(self._f_expr, mul_symbol="dot")
         fn_label = f"${fn_label}$"
-        fig, ax = plotmath.plot(
-            functions=[numpy_func],
-            fn_labels=[fn_label],
+        fig, ax = _plot_samples(
+            samples,
+            fn_label,
             xmin=definisjonsmengde[0],
             xmax=definisjonsmengde[1],
             ymin=ymin,
             ymax=ymax,
-            ticks=True,
             xstep=xstep,
             ystep=ystep,
         )
@@ -87,7 +90,7 @@ class RegresjonModell(Funksjon):
         if ynavn is not None:
             ax.set_ylabel(ynavn, fontsize=16, rotation=90, loc="top")
 
-        plotmath.show()
+        return finish(fig, ax, save=lagre, return_fig=returner_figur)
 
 
 def reg(
@@ -103,24 +106,41 @@ def lag_modell(
     xdata,
     ydata,
 ):
-    import sympy
-    from scipy.optimize import curve_fit
-
-    f_expr = sympy.sympify(modell)
-    vars = f_expr.free_symbols
-    vars = [str(var) for var in vars]
-    vars = sorted(vars)
-    vars.remove("x")
-    params = vars[:]
-    vars = ["x"] + vars
-    modell = sympy.lambdify(vars, f_expr)
-
-    popt, _ = curve_fit(
-        f=modell,
-        xdata=xdata,
-        ydata=ydata,
-    )
-
-    f_expr = f_expr.subs({var: round(val, 3) for var, val in zip(params, popt)})
-
-    return RegresjonModell(f_expr, xdata, ydata)
+    """Tilpasser `modell` til dataene med minste kvadraters metode.
+
+    Args:
+        modell (str): modellen, et uttrykk i `x` og parameterne som skal tilpasses, for eksempel `"a*exp(b*x)"`.
+        xdata (list eller numpy.ndarray): x-verdiene.
+        ydata (list eller numpy.ndarray): y-verdiene.
+
+    Returns:
+        RegresjonModell: modellen med parameterne avrundet til tre desimaler. De uavrundede verdiene og statistikken for tilpasningen finnes i `parameters`, `covariance`, `residuals` og `r_squared`.
+    """
+    f_expr, fit = _fit(_compile_model(modell), xdata, ydata)
+    return RegresjonModell(f_expr, xdata, ydata, fit)
+
+
+def lag_modeller(modell, datasett, arbeidere=None, chunksize=64):
+    """Tilpasser den samme modellen til mange datasett parallelt.
+
+    Args:
+        modell (str): modellen, som for `lag_modell`.
+        datasett (iterable): par `(xdata, ydata)`.
+        arbeidere (int, optional): antall prosesser. Standardverdi: antall CPU-er.
+        chunksize (int): antall datasett som sendes til en prosess om gangen. Standardverdi: `64`.
+
+    Returns:
+        list: en `RegresjonModell` for hvert datasett, i samme rekkefølge. Et datasett som ikke kan tilpasses, gir unntaket i stedet for modellen.
+
+    Eksempler:
+        >>> from casify import *
+        >>> modeller = lag_modeller("a*x + b", [([0, 1, 2], [1, 3, 5]), ([0, 1, 2], [2, 1, 0])])
+        >>> [round(m.r_squared, 3) for m in modeller]
+        [1.0, 1.0]
+    """
+    datasett = list(datasett)
+    resultater = _fit_many(modell, datasett, arbeidere, chunksize)
+    return [
+        RegresjonModell(f_expr, xdata, ydata, fit) if fit is not None else f_expr
+        for (xdata, ydata), (f_expr, fit) in zip(datasett, resultater)
+    ]
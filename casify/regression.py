@@ -1,11 +1,50 @@
-from .function import Function
+from collections import namedtuple
 
+from .cache import _MISSING, _model_cache, parse
+from .function import Function, _plot_samples
+from .printing import pretty
+from .rendering import finish
+from .sampling import sample, value_range
 
-class RegressionModel(Function):
-    def __init__(self, f_expr, xdata, ydata):
+
+Fit = namedtuple("Fit", ["parameters", "covariance", "residuals", "r_squared"])
+Fit.__doc__ = """Statistics of a fitted model.
+
+`parameters` maps each parameter name to its fitted (unrounded) value, `covariance` is the
+estimated covariance matrix of the parameters in the same order, `residuals` are the
+differences `ydata - model(xdata)`, and `r_squared` is the coefficient of determination."""
+
+
+class FitStatistics:
+    """The statistics of a fitted model, shared by `RegressionModel` and `RegresjonModell`."""
+
+    @property
+    def parameters(self):
+        """dict: the fitted value of each parameter."""
+        return self._fit.parameters
+
+    @property
+    def covariance(self):
+        """numpy.ndarray: the estimated covariance matrix of the parameters."""
+        return self._fit.covariance
+
+    @property
+    def residuals(self):
+        """numpy.ndarray: `ydata` minus the model evaluated at `xdata`."""
+        return self._fit.residuals
+
+    @property
+    def r_squared(self):
+        """float: the coefficient of determination, R²."""
+        return self._fit.r_squared
+
+
+class RegressionModel(Function, FitStatistics):
+    def __init__(self, f_expr, xdata, ydata, fit=None):
         super().__init__(f_expr)
         self._xdata = xdata
         self._ydata = ydata
+        self._fit = fit
 
     def __repr__(self):
         return str(self._f_expr)
@@ -13,7 +52,7 @@ class RegressionModel(Function):
     def __str__(self):
         import sympy
 
-        return sympy.pretty(self._f_expr)
+        return pretty(self._f_expr)
 
     def graph(
         self,
@@ -23,15 +62,11 @@ class RegressionModel(Function):
         xstep=1,
         ystep=1,
         plot_data=True,
+        save=None,
+        return_fig=False,
     ):
-        import plotmath
-        import numpy
         import sympy
 
-        # numpy_func = sympy.lambdify("x", self._f_expr, "numpy")
-        def numpy_func(x):
-            return numpy.array([self(i) for i in x])
-
         if domain is not None:
             xmin, xmax = domain
             if xmin != 0:
@@ -40,31 +75,32 @@ class RegressionModel(Function):
             else:
                 xmax = xmax + xstep
 
-            x_vals = numpy.linspace(xmin, xmax, 1024)
+            samples = sample(self._numeric(), xmin, xmax)
+            y_low, y_high = value_range(samples)
 
-            ymin = int(numpy.min(numpy_func(x_vals)))
+            ymin = int(y_low)
             n = ymin // ystep + 1
             ymin = n * ystep
             ymin = ymin if ymin < 0 else 0
 
-            ymax = int(numpy.max(numpy_func(x_vals)))
+            ymax = int(y_high)
             n = ymax // ystep + 1
             ymax = n * ystep
 
         else:
             xmin, xmax = (-6, 6)
             ymin, ymax = (-6, 6)
+            samples = sample(self._numeric(), xmin, xmax)
 
         fn_label = "y = " + sympy.latex(self._f_expr, mul_symbol="dot")
         fn_label = f"${fn_label}$"
-        fig, ax = plotmath.plot(
-            functions=[numpy_func],
-            fn_labels=[fn_label],
+        fig, ax = _plot_samples(
+            samples,
+            fn_label,
             xmin=xmin,
             xmax=xmax,
             ymin=ymin,
             ymax=ymax,
-            ticks=True,
             xstep=xstep,
             ystep=ystep,
         )
@@ -78,7 +114,7 @@ class RegressionModel(Function):
         if ylabel is not None:
             ax.set_ylabel(ylabel, fontsize=16, rotation=90, loc="top")
 
-        plotmath.show()
+        return finish(fig, ax, save=save, return_fig=return_fig)
 
 
 def make_model(
@@ -86,24 +122,198 @@ def make_model(
     xdata,
     ydata,
 ):
+    """Fits `model` to the data by nonlinear least squares.
+
+    Args:
+        model (str): the model, an expression in `x` and the parameters to fit, such as
+            `"a*exp(b*x)"`.
+        xdata (list or numpy.ndarray): the x-values.
+        ydata (list or numpy.ndarray): the y-values.
+
+    Returns:
+        RegressionModel: the model with the fitted parameters rounded to three decimals.
+        The unrounded values and the fit statistics are available as `parameters`,
+        `covariance`, `residuals` and `r_squared`.
+    """
+    f_expr, fit = _fit(_compile_model(model), xdata, ydata)
+    return RegressionModel(f_expr, xdata, ydata, fit)
+
+
+def make_models(model, datasets, workers=None, chunksize=64):
+    """Fits the same model to many datasets in a pool of processes.
+
+    The model and the Jacobian of its parameters are compiled once per process, and the
+    Jacobian is passed to the optimizer instead of being estimated by finite differences.
+
+    Args:
+        model (str): the model, as for `make_model`.
+        datasets (iterable): `(xdata, ydata)` pairs.
+        workers (int, optional): number of processes. Defaults to the number of CPUs. With
+            `workers=1` the datasets are fitted one by one in the calling process.
+        chunksize (int): number of datasets sent to a process at a time. Defaults to `64`.
+
+    Returns:
+        list: a `RegressionModel` for each dataset, in order. A dataset that can't be fitted
+        gets the exception in its place instead of stopping the batch.
+
+    Examples:
+        >>> from casify import *
+        >>> models = make_models("a*x + b", [([0, 1, 2], [1, 3, 5]), ([0, 1, 2], [2, 1, 0])])
+        >>> [{name: round(value, 3) for name, value in m.parameters.items()} for m in models]
+        [{'a': 2.0, 'b': 1.0}, {'a': -1.0, 'b': 2.0}]
+        >>> models[0].r_squared
+        1.0
+    """
+    datasets = list(datasets)
+    results = _fit_many(model, datasets, workers, chunksize)
+    return [
+        RegressionModel(f_expr, xdata, ydata, fit) if fit is not None else f_expr
+        for (xdata, ydata), (f_expr, fit) in zip(datasets, results)
+    ]
+
+
+_Template = namedtuple("_Template", ["f_expr", "params", "func", "jacobian", "linear"])
+
+
+def _compile_model(model):
+    """Parses `model` and compiles it and its Jacobian with respect to the parameters.
+
+    The parameters are the symbols other than `x`, in alphabetical order. `func(x, *p)`
+    evaluates the model and `jacobian(x, *p)` returns its derivatives with respect to each
+    parameter as the columns of an array, as `scipy.optimize.curve_fit` expects.
+
+    The model is linear in its parameters if none of these derivatives depends on a
+    parameter, as for `a*x**2 + b*x + c` or `a*exp(x) + b`. The derivatives are then the
+    basis functions, and the Jacobian is the design matrix of a linear least-squares
+    problem.
+
+    Compiled models are cached by their parsed expression.
+    """
+    f_expr = parse(model)
+    template = _model_cache.get(f_expr, _MISSING)
+    if template is _MISSING:
+        template = _compile_expression(f_expr)
+        _model_cache.set(f_expr, template)
+    return template
+
+
+def _compile_expression(f_expr):
+    import numpy
     import sympy
+
+    x = sympy.Symbol("x")
+    params = sorted(f_expr.free_symbols - {x}, key=str)
+    func = sympy.lambdify([x, *params], f_expr, "numpy")
+    derivatives = [sympy.diff(f_expr, param) for param in params]
+    columns = sympy.lambdify([x, *params], derivatives, "numpy")
+    linear = bool(params) and not any(d.has(*params) for d in derivatives)
+
+    def jacobian(xdata, *values):
+        xdata = numpy.asarray(xdata, dtype=float)
+        return numpy.column_stack(
+            [numpy.broadcast_to(column, xdata.shape) for column in columns(xdata, *values)]
+        )
+
+    return _Template(f_expr, [str(param) for param in params], func, jacobian, linear)
+
+
+def _fit(template, xdata, ydata):
+    """Fits a compiled model to one dataset.
+
+    Models that are linear in their parameters are solved in closed form by `_linear_fit`;
+    the others by `scipy.optimize.curve_fit`, starting from all parameters equal to one.
+
+    Returns:
+        tuple: the model with the fitted parameters rounded to three decimals, and its `Fit`.
+    """
     from scipy.optimize import curve_fit
 
-    f_expr = sympy.sympify(model)
-    vars = f_expr.free_symbols
-    vars = [str(var) for var in vars]
-    vars = sorted(vars)
-    vars.remove("x")
-    params = vars[:]
-    vars = ["x"] + vars
-    model = sympy.lambdify(vars, f_expr)
-
-    popt, _ = curve_fit(
-        f=model,
-        xdata=xdata,
-        ydata=ydata,
+    if template.linear:
+        popt, pcov = _linear_fit(template, xdata, ydata)
+    else:
+        popt, pcov = curve_fit(
+            f=template.func,
+            xdata=xdata,
+            ydata=ydata,
+            jac=template.jacobian,
+        )
+    f_expr = template.f_expr.subs(
+        {var: round(val, 3) for var, val in zip(template.params, popt)}
     )
+    return f_expr, _statistics(template, popt, pcov, xdata, ydata)
+
+
+def _linear_fit(template, xdata, ydata):
+    """Solves the least-squares problem of a model that is linear in its parameters.
+
+    With every parameter set to zero the model gives the part without parameters, which is
+    subtracted from `ydata`; the rest is the design matrix (the Jacobian) times the
+    parameters. The covariance is scaled by the residual variance, as `curve_fit` does, and
+    is infinite if there are no more points than parameters.
+
+    Returns:
+        tuple: `(popt, pcov)`, as `curve_fit` returns them.
+    """
+    import numpy
+
+    xdata, ydata = numpy.asarray(xdata, dtype=float), numpy.asarray(ydata, dtype=float)
+    zeros = numpy.zeros(len(template.params))
+    design = template.jacobian(xdata, *zeros)
+    offset = numpy.broadcast_to(template.func(xdata, *zeros), ydata.shape)
+
+    popt, _, rank, _ = numpy.linalg.lstsq(design, ydata - offset, rcond=None)
+
+    dof = ydata.size - popt.size
+    if dof > 0 and rank == popt.size:
+        residuals = ydata - offset - design @ popt
+        pcov = numpy.linalg.inv(design.T @ design) * (residuals @ residuals / dof)
+    else:
+        pcov = numpy.full((popt.size, popt.size), numpy.inf)
+    return popt, pcov
+
+
+def _statistics(template, popt, pcov, xdata, ydata):
+    import numpy
+
+    xdata, ydata = numpy.asarray(xdata, dtype=float), numpy.asarray(ydata, dtype=float)
+    residuals = ydata - numpy.broadcast_to(template.func(xdata, *popt), ydata.shape)
+    total = numpy.sum((ydata - ydata.mean()) ** 2)
+    r_squared = 1 - numpy.sum(residuals**2) / total if total > 0 else float("nan")
+    return Fit(
+        dict(zip(template.params, map(float, popt))),
+        numpy.asarray(pcov),
+        residuals,
+        float(r_squared),
+    )
+
+
+_template = None  # the model compiled in this worker process, set by `_init_worker`
+
+
+def _init_worker(model):
+    global _template
+    _template = _compile_model(model)
+
+
+def _try_fit(template, dataset):
+    try:
+        return _fit(template, *dataset)
+    except Exception as exc:  # returned in place of the fit
+        return exc, None
+
+
+def _fit_item(dataset):
+    return _try_fit(_template, dataset)
+
+
+def _fit_many(model, datasets, workers=None, chunksize=64):
+    """Fits `model` to every dataset. Returns `(f_expr, fit)` pairs, or `(exception, None)`
+    for datasets that couldn't be fitted."""
+    from .timeout import _mp_context
 
-    f_expr = f_expr.subs({var: round(val, 3) for var, val in zip(params, popt)})
+    if workers == 1:
+        template = _compile_model(model)
+        return [_try_fit(template, dataset) for dataset in datasets]
 
-    return RegressionModel(f_expr, xdata, ydata)
+    with _mp_context().Pool(workers, initializer=_init_worker, initargs=(model,)) as pool:
+        return pool.map(_fit_item, datasets, chunksize=chunksize)
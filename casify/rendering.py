@@ -0,0 +1,104 @@
+def finish(fig, ax, save=None, return_fig=False):
+    """Shows, saves or returns a finished figure.
+
+    Without `save` or `return_fig` the figure is shown, as the graph methods always did. A
+    saved figure that isn't returned is closed, so rendering many figures doesn't keep them
+    all in memory.
+
+    Args:
+        fig (matplotlib.figure.Figure): the figure.
+        ax (matplotlib.axes.Axes): its axes.
+        save (str or pathlib.Path, optional): file to save the figure to. The format follows
+            the extension, and missing directories are created.
+        return_fig (bool): return the figure instead of showing it.
+
+    Returns:
+        tuple: `(fig, ax)` if `return_fig` is true, otherwise `None`.
+    """
+    import matplotlib.pyplot as plt
+    import plotmath
+
+    if save is not None:
+        import pathlib
+
+        path = pathlib.Path(save)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fig.savefig(path, transparent=True)
+
+    if return_fig:
+        return fig, ax
+    if save is not None:
+        plt.close(fig)
+    else:
+        plotmath.show()
+    return None
+
+
+def render_many(functions, outdir, fmt="png", workers=None, chunksize=8, **options):
+    """Saves the graphs of many functions as image files, rendered in a pool of processes.
+
+    The workers draw with matplotlib's non-interactive Agg backend and never show a window,
+    so this runs on machines without a display.
+
+    Args:
+        functions (list or dict): the functions, as `Function` objects or expressions in `x`.
+            A dict maps file names (without extension) to functions; the files of a list are
+            numbered in order.
+        outdir (str or pathlib.Path): directory to save the files in. It is created if
+            needed.
+        fmt (str): `"png"` or `"svg"`. Defaults to `"png"`.
+        workers (int, optional): number of processes. Defaults to the number of CPUs. With
+            `workers=1` the graphs are drawn in the calling process.
+        chunksize (int): number of graphs sent to a process at a time.
+        **options: passed on to `Function.graph`, such as `domain`, `xstep` or `xlabel`.
+
+    Returns:
+        list: the paths of the saved files, in the order of `functions`.
+
+    Examples:
+        >>> from casify import render_many
+        >>> render_many({"f": "x**2 - 2", "g": "1/x"}, "figures", domain=(-4, 4))
+        ['figures/f.png', 'figures/g.png']
+    """
+    import os
+
+    from .timeout import _mp_context
+
+    if fmt not in ("png", "svg"):
+        raise ValueError(f"Unsupported format {fmt!r}, expected 'png' or 'svg'")
+
+    if isinstance(functions, dict):
+        names, functions = list(functions), list(functions.values())
+    else:
+        functions = list(functions)
+        width = len(str(max(len(functions) - 1, 0)))
+        names = [f"{i:0{width}d}" for i in range(len(functions))]
+
+    os.makedirs(outdir, exist_ok=True)
+    paths = [os.path.join(outdir, f"{name}.{fmt}") for name in names]
+    tasks = [(function, path, options) for function, path in zip(functions, paths)]
+
+    if workers == 1:
+        for task in tasks:
+            _render(task)
+        return paths
+
+    with _mp_context().Pool(workers, initializer=_use_agg) as pool:
+        for _ in pool.imap_unordered(_render, tasks, chunksize=chunksize):
+            pass
+    return paths
+
+
+def _use_agg():
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def _render(task):
+    from .function import Function
+
+    function, path, options = task
+    if not isinstance(function, Function):
+        function = Function(function)
+    function.graph(save=path, **options)
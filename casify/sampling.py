@@ -0,0 +1,131 @@
+from collections import namedtuple
+
+Samples = namedtuple("Samples", ["xs", "ys", "breaks"])
+Samples.__doc__ = """Points sampled from a function for plotting.
+
+`xs` and `ys` are ready to pass to `plot`: a `nan` is inserted at every discontinuity so the
+line is broken there. `breaks` holds the x-values of the discontinuities and of the vertical
+asymptotes."""
+
+
+def sample(f, a, b, initial=129, max_depth=10, tol=1e-3, max_points=20_000):
+    """Samples `f` on `[a, b]`, densely where it curves or jumps and coarsely elsewhere.
+
+    Starting from `initial` equally spaced points, every interval whose midpoint is further
+    than `tol` (relative to the typical spread of the values) from the straight line between
+    its ends is halved, level by level, for at most `max_depth` levels. The same happens where
+    the function stops being defined (at the edge of the domain of `sqrt(x)`, say). Intervals
+    that are still steep after `max_depth` halvings and change sign across a large jump (a
+    pole) or jump much further than their neighbours (a step) break the line.
+
+    Each level evaluates all new midpoints in one call, so `f` should be vectorized, such as
+    the callables returned by `casify.numeric.lambdify`.
+
+    Args:
+        f (callable): the function, mapping an ndarray to an ndarray.
+        a (float): left end of the interval.
+        b (float): right end of the interval.
+        initial (int): number of equally spaced starting points. Defaults to `129`.
+        max_depth (int): maximum number of halvings of a starting interval. Defaults to `10`.
+        tol (float): allowed deviation from a straight line, relative to the spread of the
+            values. Defaults to `1e-3`.
+        max_points (int): stop refining once this many points are sampled. Defaults to `20000`.
+
+    Returns:
+        Samples: the points, with `nan` at the breaks, and the x-values of the breaks.
+    """
+    import numpy
+
+    xs = numpy.linspace(a, b, initial)
+    ys = numpy.asarray(f(xs), dtype=float)
+    center, scale = _center_and_spread(ys)
+    refine = numpy.ones(initial - 1, dtype=bool)
+
+    with numpy.errstate(all="ignore"):
+        for _ in range(max_depth):
+            (intervals,) = numpy.nonzero(refine)
+            if intervals.size == 0 or xs.size + intervals.size > max_points:
+                break
+
+            mids = (xs[intervals] + xs[intervals + 1]) / 2
+            ys_mid = numpy.asarray(f(mids), dtype=float)
+            left, right = ys[intervals], ys[intervals + 1]
+            finite_mid = numpy.isfinite(ys_mid)
+            bad = (
+                (numpy.abs(ys_mid - (left + right) / 2) > tol * scale)
+                | (numpy.isfinite(left) != finite_mid)
+                | (numpy.isfinite(right) != finite_mid)
+            )
+
+            # Each interval is refined further on both halves if its midpoint was bad. The
+            # flags belong to the point each interval starts at.
+            flags = numpy.zeros(xs.size, dtype=bool)
+            flags[intervals] = bad
+            order = numpy.argsort(numpy.concatenate([xs, mids]), kind="stable")
+            xs = numpy.concatenate([xs, mids])[order]
+            ys = numpy.concatenate([ys, ys_mid])[order]
+            refine = numpy.concatenate([flags, bad])[order][:-1]
+
+        # Among the intervals refined all the way, a pole shows up as a large jump across
+        # which the sign changes, and a step as a jump far larger than its neighbours.
+        finest = numpy.diff(xs) <= (b - a) / ((initial - 1) * 2**max_depth) * 1.01
+        finite = numpy.isfinite(ys[:-1]) & numpy.isfinite(ys[1:])
+        jumps = numpy.where(finite, numpy.abs(numpy.diff(ys)), 0.0)
+        neighbours = numpy.maximum(
+            numpy.concatenate([[0.0], jumps[:-1]]), numpy.concatenate([jumps[1:], [0.0]])
+        )
+        pole = (numpy.sign(ys[:-1]) * numpy.sign(ys[1:]) < 0) & (jumps > 0.25 * scale)
+        step = (jumps > 10 * neighbours) & (jumps > 0.01 * scale)
+        (breaks,) = numpy.nonzero(finest & finite & (pole | step))
+
+        # A pole hit exactly, or at the edge of the domain (log(x) at 0), leaves a point
+        # without a value next to values far from the rest.
+        defined = numpy.isfinite(ys)
+        edges = defined[:-1] != defined[1:]
+        outer = numpy.where(defined[:-1], ys[:-1], ys[1:])
+        asymptotes = numpy.where(defined[:-1], xs[1:], xs[:-1])[
+            edges & (numpy.abs(outer - center) > 2 * scale)
+        ]
+
+    break_xs = (xs[breaks] + xs[breaks + 1]) / 2
+    xs = numpy.insert(xs, breaks + 1, break_xs)
+    ys = numpy.insert(ys, breaks + 1, numpy.nan)
+    return Samples(xs, ys, numpy.union1d(break_xs, asymptotes))
+
+
+def value_range(samples, margin=0.02):
+    """Returns the smallest and largest sampled value, ignoring values close to a break.
+
+    Near a pole the values grow without bound, so points closer to a break than `margin` times
+    the width of the interval are left out.
+
+    Returns:
+        tuple: `(ymin, ymax)`, or `(0.0, 0.0)` if no value is finite.
+    """
+    import numpy
+
+    xs, ys, breaks = samples
+    usable = numpy.isfinite(ys)
+    width = xs[-1] - xs[0]
+    for x in breaks:
+        usable &= numpy.abs(xs - x) > margin * width
+    if not usable.any():
+        usable = numpy.isfinite(ys)
+    if not usable.any():
+        return 0.0, 0.0
+    return float(ys[usable].min()), float(ys[usable].max())
+
+
+def _center_and_spread(ys):
+    """Returns the median and the typical spread of `ys`, ignoring the extremes (which poles
+    blow up)."""
+    import numpy
+
+    finite = ys[numpy.isfinite(ys)]
+    if finite.size == 0:
+        return 0.0, 1.0
+    low, center, high = numpy.percentile(finite, [5, 50, 95])
+    spread = high - low
+    if spread <= 0:
+        spread = numpy.max(numpy.abs(finite))
+    return float(center), float(spread) if spread > 0 else 1.0
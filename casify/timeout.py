@@ -0,0 +1,175 @@
+import contextlib
+import signal
+import threading
+
+
+_default_timeout = None
+
+
+class CasifyTimeout(TimeoutError):
+    """Raised when a computation runs longer than its time limit."""
+
+
+def set_default_timeout(seconds):
+    """Sets the time limit used by `solve`, `nsolve`, `nløs` and `Function.integral` when they
+    are called without `timeout`. `None` (the initial value) means no limit.
+
+    Examples:
+        >>> import casify
+        >>> casify.set_default_timeout(5)
+    """
+    global _default_timeout
+
+    _default_timeout = seconds
+
+
+def get_default_timeout():
+    """Returns the time limit set with `set_default_timeout`."""
+    return _default_timeout
+
+
+def resolve_timeout(timeout):
+    """Returns `timeout`, or the default time limit if it is `None`."""
+    return _default_timeout if timeout is None else timeout
+
+
+@contextlib.contextmanager
+def time_limit(seconds):
+    """Raises `CasifyTimeout` inside the `with` block once it has run for `seconds`.
+
+    The limit is enforced with `SIGALRM`, which interrupts pure-Python work such as
+    `sympy.solve`. That signal is only available on POSIX systems and can only be handled
+    in the main thread; anywhere else, or if `seconds` is `None`, the block runs unbounded.
+
+    Args:
+        seconds (float or None): the time limit.
+    """
+    if (
+        seconds is None
+        or not hasattr(signal, "SIGALRM")
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        yield
+        return
+
+    def _raise_timeout(signum, frame):
+        raise CasifyTimeout(f"Computation exceeded the time limit of {seconds} s")
+
+    previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+def _mp_context():
+    """Returns the multiprocessing context casify runs its worker processes in.
+
+    `fork` is preferred where it exists, so workers inherit the functions defined in
+    `__main__` that equations such as `"f(1) = 2"` refer to. Forking while other threads are
+    running can leave locks held by those threads locked forever in the child, so `forkserver`
+    (or the platform default) is used then. Like any program starting processes that way, the
+    main module must then guard its code with `if __name__ == "__main__":`.
+    """
+    import multiprocessing
+    import threading
+
+    methods = multiprocessing.get_all_start_methods()
+    if "fork" in methods and threading.active_count() == 1:
+        return multiprocessing.get_context("fork")
+    if "forkserver" in methods:
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context()
+
+
+def _preload():
+    """Imports the modules casify computes with.
+
+    An exception raised by `time_limit` in the middle of an import leaves a half-initialized
+    module in `sys.modules`, which breaks every later call in that process, and importing
+    SymPy can take longer than a short time limit. So every process imports these before
+    its clock starts.
+    """
+    import numpy  # noqa: F401
+    import scipy.integrate  # noqa: F401
+    import scipy.optimize  # noqa: F401
+    import sympy  # noqa: F401
+
+    from . import equation  # noqa: F401
+
+
+def _run_and_send(connection, func, args, kwargs):
+    # A forked process has inherited the imports; others report once they have them, so
+    # the parent doesn't count them against the time limit.
+    _preload()
+    connection.send(None)
+    try:
+        message = (True, func(*args, **kwargs))
+    except Exception as exc:
+        message = (False, exc)
+    try:
+        connection.send(message)
+    except Exception as exc:  # the result or exception couldn't be pickled
+        connection.send((False, RuntimeError(repr(exc))))
+    finally:
+        connection.close()
+
+
+def run_with_timeout(func, *args, timeout=None, **kwargs):
+    """Calls `func(*args, **kwargs)` in a separate process that is killed after `timeout` seconds.
+
+    Killing the process is what reclaims the CPU from a runaway `sympy` call; a thread can't be
+    stopped. `func`, its arguments and its result must be picklable. Inside a daemonic process
+    (such as the workers of `solve_many`), which can't start processes, the limit is enforced
+    with `time_limit` instead. The clock starts once the process has imported SymPy and the
+    solvers, so start-up time isn't counted.
+
+    Args:
+        func (callable): the function to call.
+        *args: positional arguments for `func`.
+        timeout (float, optional): the time limit. `None` calls `func` directly without a limit.
+        **kwargs: keyword arguments for `func`.
+
+    Returns:
+        The return value of `func`.
+
+    Raises:
+        CasifyTimeout: if `func` doesn't finish within `timeout` seconds.
+    """
+    import multiprocessing
+
+    if timeout is None:
+        return func(*args, **kwargs)
+
+    if multiprocessing.current_process().daemon:
+        with time_limit(timeout):
+            return func(*args, **kwargs)
+
+    _preload()
+    context = _mp_context()
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(
+        target=_run_and_send, args=(sender, func, args, kwargs), daemon=True
+    )
+    process.start()
+    sender.close()
+    try:
+        receiver.recv()  # the child has started and imported its modules
+        if not receiver.poll(timeout):
+            raise CasifyTimeout(f"Computation exceeded the time limit of {timeout} s")
+        succeeded, result = receiver.recv()
+    except EOFError:
+        raise RuntimeError(
+            f"The process computing {func.__name__} exited without a result"
+        ) from None
+    finally:
+        if process.is_alive():
+            process.kill()
+        process.join()
+        receiver.close()
+
+    if succeeded:
+        return result
+    raise result
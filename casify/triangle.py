@@ -7,6 +7,7 @@ def draw_triangle(
     radius=None,  # None → automatic per‑vertex
     alpha=0.15,
     show=True,
+    save=None,
     fontsize=20,
     label_angles=(True, True, True),
     vertex_labels=("A", "B", "C"),
@@ -23,6 +24,8 @@ def draw_triangle(
                        False → nothing
     • Vertex labels are placed just outside the triangle (0.7 × arc radius).
     • Angle labels sit on the bisector at 1.60 × arc radius, clearing the arc.
+    • `save`:  a file to save the figure to instead of showing it. With `show=False`
+               the axes are still returned.
     """
 
     # ───────────────────────────── imports ─────────────────────────────
@@ -212,7 +215,11 @@ def draw_triangle(
     ax.axis("equal")
     if axis_off:
         ax.axis("off")
-    if show:
+    if save is not None:
+        from .rendering import finish
+
+        finish(ax.figure, ax, save=save, return_fig=not show)
+    elif show:
         plotmath.show()
-    else:
+    if not show:
         return ax